@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Measure config loading and registration time/memory for large tool sets."""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from mcp_stdio_toolbox.config_loader import load_config
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+
+TOOL_TEMPLATE = """
+  - name: "tool_{index}"
+    description: "Generated tool number {index}"
+    command: "echo"
+    args: ["--"]
+    timeout_sec: 30
+    input_schema:
+      type: object
+      properties:
+        text:
+          type: string
+          description: "Text to echo"
+        count:
+          type: integer
+          minimum: 1
+      required: ["text"]
+      arg_mapping:
+        - ["text"]
+        - ["count"]
+"""
+
+
+def generate_config(directory: Path, tools: int, files: int) -> Path:
+    """Write a main config plus ``files`` tool files in tools.d."""
+    tools_dir = directory / "tools.d"
+    tools_dir.mkdir()
+    per_file = -(-tools // files)
+    for file_index in range(files):
+        indexes = range(file_index * per_file, min(tools, (file_index + 1) * per_file))
+        body = "".join(TOOL_TEMPLATE.format(index=index) for index in indexes)
+        (tools_dir / f"{file_index:03d}.yaml").write_text(f"tools:{body}")
+
+    config_path = directory / "tools.yaml"
+    config_path.write_text('server:\n  name: "bench"\n')
+    return config_path
+
+
+def measure(label: str, func, memory: bool = False):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    line = f"{label:<28} {elapsed * 1000:9.1f} ms"
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"   peak {peak / 1024:9.1f} KiB"
+    print(line)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=1000, help="Number of tools")
+    parser.add_argument("--files", type=int, default=50, help="Number of tool files")
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Also report peak allocations (tracing slows every step down)",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = generate_config(Path(tmp), args.tools, args.files)
+        print(f"{args.tools} tools in {args.files} files\n")
+
+        config = measure("load_config", lambda: load_config(config_path), args.memory)
+
+        registry = ToolRegistry()
+
+        def register_all():
+            for tool_config in config.tools:
+                registry.register_tool(tool_config)
+
+        measure("register (lazy)", register_all, args.memory)
+        measure("tool definitions", registry.get_tool_definitions, args.memory)
+        handler = measure(
+            "first call materialize",
+            lambda: registry.get_handler("tool_0"),
+            args.memory,
+        )
+        measure(
+            "first call run",
+            lambda: asyncio.run(handler({"text": "hello", "count": 1})),
+            args.memory,
+        )
+        measure(
+            "materialize all (eager)",
+            lambda: [registry.get_handler(name) for name in registry.tools],
+            args.memory,
+        )
+
+
+if __name__ == "__main__":
+    main()
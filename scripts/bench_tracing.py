@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Measure the cost of tracing per span and per tool call.
+
+Disabled tracing costs one no-op span per traced step (about six per call).
+The per-call numbers compare a subprocess tool with an in-process one, where
+any overhead is most visible.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from mcp_stdio_toolbox.config_loader import ToolConfig, TracingConfig
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+from mcp_stdio_toolbox.tracing import configure_tracing, start_span
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"text": {"type": "string"}},
+    "arg_mapping": [["text"]],
+}
+
+TOOLS = [
+    ToolConfig("echo", "Echo as a subprocess", "echo", [], SCHEMA),
+    ToolConfig(
+        "python_dedent",
+        "Dedent text in-process",
+        "",
+        [],
+        SCHEMA,
+        tool_type="python",
+        function="textwrap:dedent",
+    ),
+]
+
+
+def bench_spans(iterations: int) -> float:
+    """Nanoseconds per span, net of an empty loop."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        pass
+    empty = time.perf_counter_ns() - start
+
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        with start_span("execute", {"process.pid": 1}) as span:
+            span.set_attribute("output.bytes", 0)
+    return (time.perf_counter_ns() - start - empty) / iterations
+
+
+async def bench_calls(calls: int) -> dict[str, float]:
+    """Mean microseconds per handler call for each tool."""
+    registry = ToolRegistry()
+    for tool in TOOLS:
+        registry.register_tool(tool)
+
+    results = {}
+    for tool in TOOLS:
+        handler = registry.get_handler(tool.name)
+        arguments = {"text": "hello"}
+        await handler(arguments)
+        start = time.perf_counter()
+        for _ in range(calls):
+            with start_span("tools/call", {"tool.name": tool.name}):
+                await handler(arguments)
+        results[tool.name] = (time.perf_counter() - start) / calls * 1e6
+    await registry.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500, help="Calls per tool")
+    parser.add_argument(
+        "--spans", type=int, default=1_000_000, help="Iterations for the span loop"
+    )
+    args = parser.parse_args()
+
+    configure_tracing(TracingConfig())
+    print(f"disabled span: {bench_spans(args.spans):6.0f} ns\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = {
+            "disabled": TracingConfig(),
+            "jsonl": TracingConfig(
+                enabled=True, exporter="jsonl", path=str(Path(tmp) / "traces.jsonl")
+            ),
+        }
+        for mode, config in modes.items():
+            tracer = configure_tracing(config)
+            calls = asyncio.run(bench_calls(args.calls))
+            tracer.shutdown()
+
+            print(f"tracing {mode}:")
+            for name, micros in calls.items():
+                print(f"  {name:<14} {micros:9.1f} us per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Per-tool circuit breaker to fail fast on persistently broken backends."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from .config_loader import CircuitBreakerConfig
+from .metrics import Metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of running a tool whose circuit is open."""
+
+    def __init__(self, tool_name: str, retry_after_sec: float):
+        super().__init__(
+            f"Circuit open for {tool_name}: failing fast, "
+            f"retry after {retry_after_sec:.1f} seconds"
+        )
+        self.tool_name = tool_name
+        self.retry_after_sec = retry_after_sec
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "error": "circuit_open",
+            "tool": self.tool_name,
+            "retry_after_sec": round(self.retry_after_sec, 1),
+            "message": str(self),
+        }
+
+
+class CircuitBreaker:
+    """Track recent outcomes of one tool and trip open when too many fail.
+
+    Outcomes inside a rolling ``window_sec`` window are kept. Once at least
+    ``min_calls`` outcomes are known and the failed share reaches
+    ``failure_ratio``, the circuit opens and calls are rejected for
+    ``open_sec``. It then turns half-open and lets ``half_open_probes`` calls
+    through; if they all succeed the circuit closes, any failure reopens it.
+    """
+
+    def __init__(
+        self,
+        tool_name: str,
+        config: CircuitBreakerConfig,
+        metrics: Metrics | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.tool_name = tool_name
+        self.config = config
+        self.metrics = metrics or Metrics()
+        self.clock = clock
+        self.outcomes: deque[tuple[float, bool]] = deque()
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self._state = CLOSED
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._retry_after() <= 0:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def before_call(self):
+        """Admit a call or raise ``CircuitOpenError``."""
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self.probes_in_flight < (
+            self.config.half_open_probes - self.probe_successes
+        ):
+            self.probes_in_flight += 1
+            return
+
+        self.metrics.incr(f"circuit_rejected.{self.tool_name}")
+        raise CircuitOpenError(self.tool_name, max(self._retry_after(), 0.0))
+
+    def record_success(self):
+        if self._state == HALF_OPEN:
+            self._finish_probe()
+            self.probe_successes += 1
+            if self.probe_successes >= self.config.half_open_probes:
+                self.outcomes.clear()
+                self._set_state(CLOSED)
+            return
+        self._record(failed=False)
+
+    def record_failure(self):
+        if self._state == HALF_OPEN:
+            self._finish_probe()
+            self._trip()
+            return
+        self._record(failed=True)
+
+    def record_exit_code(self, exit_code: int):
+        if exit_code == 0 or exit_code in self.config.ignore_exit_codes:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def release(self):
+        """Forget an admitted call that ended without a verdict."""
+        if self._state == HALF_OPEN:
+            self._finish_probe()
+
+    def _record(self, failed: bool):
+        now = self.clock()
+        self.outcomes.append((now, failed))
+        while self.outcomes and self.outcomes[0][0] < now - self.config.window_sec:
+            self.outcomes.popleft()
+
+        if self._state != CLOSED or len(self.outcomes) < self.config.min_calls:
+            return
+        failures = sum(1 for _, failed in self.outcomes if failed)
+        if failures / len(self.outcomes) >= self.config.failure_ratio:
+            self._trip()
+
+    def _trip(self):
+        self.opened_at = self.clock()
+        self.metrics.incr(f"circuit_opened.{self.tool_name}")
+        self._set_state(OPEN)
+
+    def _finish_probe(self):
+        self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def _retry_after(self) -> float:
+        return self.opened_at + self.config.open_sec - self.clock()
+
+    def _set_state(self, state: str):
+        self._state = state
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self._publish()
+
+    def _publish(self):
+        self.metrics.set_gauge(f"circuit_state.{self.tool_name}", self._state)
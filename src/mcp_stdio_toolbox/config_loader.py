@@ -1,11 +1,91 @@
 """Configuration loader for MCP stdio toolbox."""
 
-from dataclasses import dataclass
+import glob
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+# libyaml's loader is several times faster when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    backoff_base_sec: float = 0.5
+    backoff_max_sec: float = 10.0
+    jitter: bool = True
+    retry_on_exit_codes: list[int] = field(default_factory=list)
+    retry_on_timeout: bool = True
+
+
+@dataclass
+class HedgePolicy:
+    percentile: float = 95
+    min_samples: int = 20
+
+
+@dataclass
+class CircuitBreakerConfig:
+    window_sec: float = 60.0
+    min_calls: int = 5
+    failure_ratio: float = 0.5
+    open_sec: float = 30.0
+    half_open_probes: int = 1
+    ignore_exit_codes: list[int] = field(default_factory=list)
+
+
+@dataclass
+class WarmupConfig:
+    args: list[str] = field(default_factory=list)
+    expected_exit_code: int = 0
+    timeout_sec: int | None = None
+
+
+@dataclass
+class HttpRequestConfig:
+    url: str
+    method: str = "GET"
+    headers: dict[str, str] = field(default_factory=dict)
+    query: dict[str, Any] = field(default_factory=dict)
+    body: Any = None
+    extract: str | None = None
+
+
+@dataclass
+class HttpClientConfig:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_sec: float = 30.0
+    max_connections_per_host: int = 10
+
+
+@dataclass
+class TracingConfig:
+    enabled: bool = False
+    exporter: str = "otlp"
+    endpoint: str | None = None
+    path: str = "toolbox-traces.jsonl"
+    service_name: str = "mcp-stdio-toolbox"
+
+
+@dataclass
+class RecordingConfig:
+    enabled: bool = False
+    path: str = "toolbox-calls.jsonl"
+    redact: list[str] = field(
+        default_factory=lambda: [
+            "*password*",
+            "*secret*",
+            "*token*",
+            "*api_key*",
+            "authorization",
+        ]
+    )
+
 
 @dataclass
 class ToolConfig:
@@ -15,6 +95,28 @@ class ToolConfig:
     args: list[str]
     input_schema: dict[str, Any]
     timeout_sec: int = 30
+    priority: int = 0
+    tool_class: str = "interactive"
+    idempotent: bool = False
+    retry: RetryPolicy | None = None
+    hedge: HedgePolicy | None = None
+    circuit_breaker: CircuitBreakerConfig | None = None
+    warmup: WarmupConfig | None = None
+    stdin_from: str | None = None
+    tool_type: str = "subprocess"
+    http: HttpRequestConfig | None = None
+    function: str | None = None
+    cpu_bound: bool = False
+
+
+@dataclass
+class SchedulingConfig:
+    max_concurrency: int | None = None
+    class_weights: dict[str, int] = field(
+        default_factory=lambda: {"interactive": 4, "bulk": 1}
+    )
+    reserved_interactive: int = 0
+    drop_unmeetable_deadlines: bool = False
 
 
 @dataclass
@@ -23,6 +125,16 @@ class ServerConfig:
     version: str = "0.1.0"
     default_timeout_sec: int = 30
     max_output_bytes: int = 1048576
+    expose_metrics: bool = False
+    circuit_breaker: CircuitBreakerConfig | None = None
+    scheduling: SchedulingConfig = field(default_factory=SchedulingConfig)
+    http: HttpClientConfig = field(default_factory=HttpClientConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
+    recording: RecordingConfig = field(default_factory=RecordingConfig)
+
+
+# Tool types and the field each one requires to know what to run
+TOOL_TYPES = {"subprocess": "command", "http": "http", "python": "function"}
 
 
 @dataclass
@@ -32,43 +144,295 @@ class Config:
 
 
 def load_config(config_path: str | Path) -> Config:
-    """Load configuration from YAML file."""
+    """Load configuration from YAML file.
+
+    Besides its own ``tools`` list, the main file may name more tool files
+    with ``include`` globs (relative to the file, unless absolute). Any
+    ``*.yaml`` files in a ``tools.d`` directory next to it are loaded too, and
+    their ``tools`` lists appended in a stable order.
+    """
     config_path = Path(config_path)
 
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    with open(config_path) as f:
-        data = yaml.safe_load(f)
+    data = _read_yaml(config_path)
+    tool_files = _find_tool_files(config_path, data.get("include", []))
 
-    if "tools" not in data:
+    if "tools" not in data and not tool_files:
         raise ValueError("Config must contain 'tools' section")
 
-    server_data = data.get("server", {})
+    server_data = data.get("server") or {}
     server = ServerConfig(
         name=server_data.get("name", "mcp-stdio-toolbox"),
         version=server_data.get("version", "0.1.0"),
         default_timeout_sec=server_data.get("default_timeout_sec", 30),
         max_output_bytes=server_data.get("max_output_bytes", 1048576),
+        expose_metrics=server_data.get("expose_metrics", False),
+        scheduling=_load_scheduling(server_data.get("scheduling") or {}),
+        circuit_breaker=_load_circuit_breaker(
+            server_data.get("circuit_breaker"), "server"
+        ),
+        http=_load_http_client(server_data.get("http") or {}),
+        tracing=_load_tracing(server_data.get("tracing") or {}),
+        recording=_load_recording(server_data.get("recording") or {}),
     )
 
+    tool_entries = list(data.get("tools") or [])
+    for path in tool_files:
+        file_data = _read_yaml(path)
+        if "tools" not in file_data:
+            raise ValueError(f"Tool file must contain 'tools' section: {path}")
+        tool_entries.extend(file_data["tools"] or [])
+
     tools = []
-    for tool_data in data["tools"]:
-        required_fields = ["name", "description", "command", "input_schema"]
-        if not all(k in tool_data for k in required_fields):
-            raise ValueError(
-                f"Tool missing required fields {required_fields}: {tool_data}"
-            )
+    seen = set()
+    for tool_data in tool_entries:
+        tool = _load_tool(tool_data, server)
+        if tool.name in seen:
+            raise ValueError(f"Duplicate tool name: {tool.name}")
+        seen.add(tool.name)
+        tools.append(tool)
+
+    return Config(server=server, tools=tools)
+
+
+def _read_yaml(path: Path) -> dict[str, Any]:
+    with open(path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
+def _find_tool_files(config_path: Path, include: list[str] | str) -> list[Path]:
+    """Resolve ``include`` globs and the ``tools.d`` directory to tool files."""
+    if isinstance(include, str):
+        include = [include]
+
+    base_dir = config_path.parent
+    files: list[Path] = []
+    for pattern in include:
+        # Path.glob() rejects absolute patterns, glob.glob() takes both.
+        root = glob.escape(str(base_dir))
+        matches = sorted(
+            Path(match)
+            for match in glob.glob(os.path.join(root, pattern), recursive=True)
+        )
+        if not matches and not any(char in pattern for char in "*?["):
+            raise FileNotFoundError(f"Included file not found: {base_dir / pattern}")
+        files.extend(match for match in matches if match.is_file())
 
-        tools.append(
-            ToolConfig(
-                name=tool_data["name"],
-                description=tool_data["description"],
-                command=tool_data["command"],
-                args=tool_data.get("args", []),
-                input_schema=tool_data["input_schema"],
-                timeout_sec=tool_data.get("timeout_sec", server.default_timeout_sec),
+    tools_dir = base_dir / "tools.d"
+    if tools_dir.is_dir():
+        files.extend(
+            sorted(
+                path
+                for path in tools_dir.iterdir()
+                if path.suffix in (".yaml", ".yml") and path.is_file()
             )
         )
 
-    return Config(server=server, tools=tools)
+    # A file matched twice (or the main file itself) is loaded once.
+    unique = []
+    seen = {config_path.resolve()}
+    for path in files:
+        if path.resolve() not in seen:
+            seen.add(path.resolve())
+            unique.append(path)
+    return unique
+
+
+def _load_tool(tool_data: dict[str, Any], server: ServerConfig) -> ToolConfig:
+    """Build one tool, filling in defaults from the server settings."""
+    tool_type = tool_data.get("type", "subprocess")
+    if tool_type not in TOOL_TYPES:
+        raise ValueError(
+            f"Tool {tool_data.get('name')}: unknown type {tool_type!r}, "
+            f"expected one of {list(TOOL_TYPES)}"
+        )
+
+    required_fields = ["name", "description", TOOL_TYPES[tool_type], "input_schema"]
+    if not all(k in tool_data for k in required_fields):
+        raise ValueError(f"Tool missing required fields {required_fields}: {tool_data}")
+
+    retry = _load_retry(tool_data)
+    hedge = _load_hedge(tool_data)
+    idempotent = tool_data.get("idempotent", False)
+    if (retry or hedge) and not idempotent:
+        raise ValueError(
+            f"Tool {tool_data['name']} must be marked idempotent to use retry or hedge"
+        )
+    if tool_type == "python" and ":" not in tool_data["function"]:
+        raise ValueError(
+            f"Tool {tool_data['name']}: function must look like 'module:function'"
+        )
+    _check_stdin_from(tool_data, tool_type)
+
+    return ToolConfig(
+        name=tool_data["name"],
+        description=tool_data["description"],
+        command=tool_data.get("command", ""),
+        args=tool_data.get("args", []),
+        input_schema=tool_data["input_schema"],
+        timeout_sec=tool_data.get("timeout_sec", server.default_timeout_sec),
+        priority=tool_data.get("priority", 0),
+        tool_class=tool_data.get("class", "interactive"),
+        idempotent=idempotent,
+        retry=retry,
+        hedge=hedge,
+        circuit_breaker=_load_circuit_breaker(
+            tool_data.get("circuit_breaker", server.circuit_breaker),
+            f"Tool {tool_data['name']}",
+        ),
+        warmup=_load_warmup(tool_data),
+        stdin_from=tool_data.get("stdin_from"),
+        tool_type=tool_type,
+        http=_load_http_request(tool_data) if tool_type == "http" else None,
+        function=tool_data.get("function"),
+        cpu_bound=tool_data.get("cpu_bound", False),
+    )
+
+
+def _check_stdin_from(tool_data: dict[str, Any], tool_type: str):
+    """Reject a ``stdin_from`` that would silently send an empty stdin."""
+    stdin_from = tool_data.get("stdin_from")
+    if stdin_from is None:
+        return
+    if tool_type != "subprocess":
+        raise ValueError(
+            f"Tool {tool_data['name']}: stdin_from only applies to subprocess tools"
+        )
+    properties = tool_data["input_schema"].get("properties", {})
+    if stdin_from != "*" and stdin_from not in properties:
+        raise ValueError(
+            f"Tool {tool_data['name']}: stdin_from must be '*' or an input "
+            f"property, got {stdin_from!r}"
+        )
+
+
+def _load_scheduling(data: dict[str, Any]) -> SchedulingConfig:
+    """Build scheduling settings from the ``server.scheduling`` block."""
+    scheduling = SchedulingConfig(
+        max_concurrency=data.get("max_concurrency"),
+        reserved_interactive=data.get("reserved_interactive", 0),
+        drop_unmeetable_deadlines=data.get("drop_unmeetable_deadlines", False),
+    )
+    if "class_weights" in data:
+        scheduling.class_weights = dict(data["class_weights"])
+
+    if scheduling.max_concurrency is not None and scheduling.max_concurrency < 1:
+        raise ValueError("scheduling.max_concurrency must be at least 1")
+    if scheduling.max_concurrency is not None and not (
+        0 <= scheduling.reserved_interactive < scheduling.max_concurrency
+    ):
+        raise ValueError(
+            "scheduling.reserved_interactive must be below max_concurrency"
+        )
+    if any(weight <= 0 for weight in scheduling.class_weights.values()):
+        raise ValueError("scheduling.class_weights must be positive")
+
+    return scheduling
+
+
+def _load_retry(tool_data: dict[str, Any]) -> RetryPolicy | None:
+    """Build a tool's retry policy from its optional ``retry`` block."""
+    data = tool_data.get("retry")
+    if not data:
+        return None
+
+    try:
+        retry = RetryPolicy(**data)
+    except TypeError as e:
+        raise ValueError(f"Tool {tool_data['name']}: invalid retry block: {e}") from e
+    if retry.max_attempts < 1:
+        raise ValueError(f"Tool {tool_data['name']}: retry.max_attempts must be >= 1")
+    return retry
+
+
+def _load_hedge(tool_data: dict[str, Any]) -> HedgePolicy | None:
+    """Build a tool's hedge policy; ``hedge: true`` selects the defaults."""
+    data = tool_data.get("hedge")
+    if not data:
+        return None
+
+    try:
+        hedge = HedgePolicy() if data is True else HedgePolicy(**data)
+    except TypeError as e:
+        raise ValueError(f"Tool {tool_data['name']}: invalid hedge block: {e}") from e
+    if not 0 < hedge.percentile <= 100:
+        raise ValueError(
+            f"Tool {tool_data['name']}: hedge.percentile must be in (0, 100]"
+        )
+    return hedge
+
+
+def _load_circuit_breaker(
+    data: dict[str, Any] | CircuitBreakerConfig | bool | None, owner: str
+) -> CircuitBreakerConfig | None:
+    """Build circuit breaker settings; ``false`` or a missing block disables it."""
+    if isinstance(data, CircuitBreakerConfig):
+        return data
+    if not data:
+        return None
+
+    try:
+        breaker = (
+            CircuitBreakerConfig() if data is True else CircuitBreakerConfig(**data)
+        )
+    except TypeError as e:
+        raise ValueError(f"{owner}: invalid circuit_breaker block: {e}") from e
+    if not 0 < breaker.failure_ratio <= 1:
+        raise ValueError(f"{owner}: circuit_breaker.failure_ratio must be in (0, 1]")
+    if breaker.min_calls < 1 or breaker.half_open_probes < 1:
+        raise ValueError(
+            f"{owner}: circuit_breaker.min_calls and half_open_probes must be >= 1"
+        )
+    return breaker
+
+
+def _load_warmup(tool_data: dict[str, Any]) -> WarmupConfig | None:
+    """Build a tool's startup probe from its optional ``warmup`` block."""
+    data = tool_data.get("warmup")
+    if not data:
+        return None
+
+    try:
+        return WarmupConfig() if data is True else WarmupConfig(**data)
+    except TypeError as e:
+        raise ValueError(f"Tool {tool_data['name']}: invalid warmup block: {e}") from e
+
+
+def _load_http_request(tool_data: dict[str, Any]) -> HttpRequestConfig:
+    """Build the request template of an ``http`` tool."""
+    data = tool_data["http"]
+    try:
+        request = HttpRequestConfig(**data)
+    except TypeError as e:
+        raise ValueError(f"Tool {tool_data['name']}: invalid http block: {e}") from e
+    request.method = request.method.upper()
+    return request
+
+
+def _load_http_client(data: dict[str, Any]) -> HttpClientConfig:
+    """Build shared HTTP client settings from the ``server.http`` block."""
+    try:
+        return HttpClientConfig(**data)
+    except TypeError as e:
+        raise ValueError(f"server: invalid http block: {e}") from e
+
+
+def _load_tracing(data: dict[str, Any]) -> TracingConfig:
+    """Build tracing settings from the ``server.tracing`` block."""
+    try:
+        tracing = TracingConfig(**data)
+    except TypeError as e:
+        raise ValueError(f"server: invalid tracing block: {e}") from e
+    if tracing.exporter not in ("otlp", "jsonl"):
+        raise ValueError("tracing.exporter must be 'otlp' or 'jsonl'")
+    return tracing
+
+
+def _load_recording(data: dict[str, Any]) -> RecordingConfig:
+    """Build call recording settings from the ``server.recording`` block."""
+    try:
+        return RecordingConfig(**data)
+    except TypeError as e:
+        raise ValueError(f"server: invalid recording block: {e}") from e
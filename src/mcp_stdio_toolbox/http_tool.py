@@ -0,0 +1,217 @@
+"""In-process HTTP tools on a shared, connection-pooling async client."""
+
+import asyncio
+import json
+import os
+import re
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, urlencode, urlsplit
+
+from .config_loader import HttpClientConfig, HttpRequestConfig
+from .subprocess_runner import SubprocessResult
+from .tracing import start_span
+
+if TYPE_CHECKING:
+    import httpx
+
+_ENV_VAR = re.compile(r"\$\{(\w+)\}")
+_PLACEHOLDER = re.compile(r"^\{(\w+)\}$")
+_MISSING = object()
+
+
+class HttpClientPool:
+    """Shared ``httpx.AsyncClient`` plus per-host concurrency limits.
+
+    The client is created on first use so servers without HTTP tools never
+    import httpx. Connections are kept alive and reused across calls.
+    """
+
+    def __init__(self, config: HttpClientConfig | None = None):
+        self.config = config or HttpClientConfig()
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry_sec,
+                ),
+                follow_redirects=True,
+            )
+        return self._client
+
+    def host_limit(self, url: str) -> asyncio.Semaphore:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(
+                self.config.max_connections_per_host
+            )
+        return self._host_limits[host]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def render_template(template: Any, values: dict[str, Any]) -> Any:
+    """Fill ``{name}`` placeholders in a template from input values.
+
+    A string that is exactly one placeholder is replaced by the raw value, so
+    numbers and lists keep their JSON type in bodies; if that input is absent
+    the entry is left out. Dicts and lists are rendered recursively.
+    ``${VAR}`` references are expanded from the environment before inputs are
+    substituted, so inputs can't reach them.
+    """
+    rendered = _render(template, values)
+    return None if rendered is _MISSING else rendered
+
+
+def _render(template: Any, values: dict[str, Any]) -> Any:
+    if isinstance(template, dict):
+        rendered = {key: _render(value, values) for key, value in template.items()}
+        return {key: value for key, value in rendered.items() if value is not _MISSING}
+    if isinstance(template, list):
+        items = [_render(item, values) for item in template]
+        return [item for item in items if item is not _MISSING]
+    if not isinstance(template, str):
+        return template
+
+    template = _expand_env(template)
+    match = _PLACEHOLDER.match(template)
+    if match:
+        return values.get(match.group(1), _MISSING)
+    return template.format_map(_Values(values))
+
+
+def render_url(template: str, values: dict[str, Any]) -> str:
+    """Render a URL template, percent-encoding substituted values.
+
+    A template that is a single placeholder (``"{url}"``) takes the whole
+    URL from the input unchanged.
+    """
+    template = _expand_env(template)
+    match = _PLACEHOLDER.match(template)
+    if match:
+        return str(_Values(values)[match.group(1)])
+    encoded = {key: quote(str(value), safe="") for key, value in values.items()}
+    return template.format_map(_Values(encoded))
+
+
+def extract_field(data: Any, path: str) -> Any:
+    """Follow a dotted path such as ``choices.0.message.content``."""
+    for part in path.split("."):
+        if isinstance(data, list):
+            data = data[int(part)]
+        else:
+            data = data[part]
+    return data
+
+
+async def run_http_request(
+    pool: HttpClientPool,
+    request: HttpRequestConfig,
+    inputs: dict[str, Any],
+    timeout_sec: float = 30,
+    max_output_bytes: int = 1048576,
+) -> SubprocessResult:
+    """Send one templated request and return it like a finished command.
+
+    2xx responses exit with 0. Other responses use the HTTP status as the
+    exit code and put the body in ``stderr``, so retry and circuit breaker
+    policies can match on status codes.
+    """
+    url = render_url(request.url, inputs)
+    headers = {
+        key: str(value)
+        for key, value in render_template(request.headers, inputs).items()
+    }
+    query = render_template(request.query, inputs)
+    if query:
+        # Appended by hand: httpx's ``params`` replaces the URL's own query.
+        separator = "&" if urlsplit(url).query else "?"
+        url += separator + urlencode(query, doseq=True)
+    body = render_template(request.body, inputs)
+    body_args: dict[str, Any] = {}
+    if isinstance(body, dict | list):
+        body_args["json"] = body
+    elif body is not None:
+        body_args["content"] = str(body).encode("utf-8")
+
+    client = pool.client()
+    try:
+        async with asyncio.timeout(timeout_sec), pool.host_limit(url):
+            with start_span("execute", {"http.request.method": request.method}) as span:
+                async with client.stream(
+                    request.method,
+                    url,
+                    headers=headers,
+                    timeout=timeout_sec,
+                    **body_args,
+                ) as response:
+                    content, truncated = await _read_capped(response, max_output_bytes)
+                span.set_attributes(
+                    {
+                        "http.response.status_code": response.status_code,
+                        "output.bytes": len(content),
+                        "output.truncated": truncated,
+                    }
+                )
+    except TimeoutError:
+        raise TimeoutError(f"Request timed out after {timeout_sec} seconds") from None
+    except Exception as e:
+        import httpx
+
+        if isinstance(e, httpx.TimeoutException):
+            raise TimeoutError(
+                f"Request timed out after {timeout_sec} seconds"
+            ) from None
+        raise RuntimeError(f"HTTP request failed: {e}") from e
+
+    text = content.decode("utf-8", errors="replace")
+    if not response.is_success:
+        return SubprocessResult("", text, response.status_code, truncated)
+
+    if request.extract and not truncated:
+        try:
+            value = extract_field(json.loads(text), request.extract)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise RuntimeError(f"Can't extract {request.extract!r}: {e}") from e
+        text = value if isinstance(value, str) else json.dumps(value)
+
+    if truncated:
+        text += "\n[OUTPUT TRUNCATED]"
+    return SubprocessResult(text, "", 0, truncated)
+
+
+async def _read_capped(
+    response: "httpx.Response", max_output_bytes: int
+) -> tuple[bytes, bool]:
+    """Stream a response body, stopping once it exceeds the output cap."""
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_output_bytes:
+            return b"".join(chunks)[:max_output_bytes], True
+    return b"".join(chunks), False
+
+
+def _expand_env(template: str) -> str:
+    def replace(match: re.Match) -> str:
+        value = os.environ.get(match.group(1), "")
+        return value.replace("{", "{{").replace("}", "}}")
+
+    return _ENV_VAR.sub(replace, template)
+
+
+class _Values(dict):
+    def __missing__(self, key: str):
+        raise ValueError(f"Missing value for template field: {key}")
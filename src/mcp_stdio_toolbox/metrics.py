@@ -0,0 +1,67 @@
+"""In-process metrics for MCP stdio toolbox."""
+
+import math
+from collections import deque
+from typing import Any
+
+
+class LatencyTracker:
+    """Keeps a bounded window of latency samples and reports percentiles."""
+
+    def __init__(self, window: int = 1024):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the nearest-rank percentile, or None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(self.samples) if self.samples else None,
+        }
+
+
+class Metrics:
+    """Counters, gauges and latency trackers keyed by dotted names."""
+
+    def __init__(self):
+        self.counters: dict[str, int] = {}
+        self.gauges: dict[str, Any] = {}
+        self.latencies: dict[str, LatencyTracker] = {}
+
+    def incr(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: Any):
+        self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        self.latency(name).record(seconds)
+
+    def latency(self, name: str) -> LatencyTracker:
+        if name not in self.latencies:
+            self.latencies[name] = LatencyTracker()
+        return self.latencies[name]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable view of all metrics."""
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "latencies": {
+                name: tracker.summary() for name, tracker in self.latencies.items()
+            },
+        }
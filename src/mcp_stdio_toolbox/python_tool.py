@@ -0,0 +1,111 @@
+"""In-process Python function tools."""
+
+import asyncio
+import functools
+import importlib
+import inspect
+import json
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from .subprocess_runner import SubprocessResult
+from .tracing import start_span
+
+
+class WorkerPool:
+    """Process pool for ``cpu_bound`` functions, started on first use.
+
+    Workers come from a fork server (or are spawned) rather than forked from
+    the server process, which has event loop and executor threads running.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = "forkserver" if "forkserver" in methods else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def load_function(reference: str) -> Callable[..., Any]:
+    """Import ``package.module:function`` and return the function."""
+    module_name, _, attribute = reference.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected 'module:function', got {reference!r}")
+
+    target: Any = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    if not callable(target):
+        raise ValueError(f"{reference} is not callable")
+    return target
+
+
+async def run_function(
+    func: Callable[..., Any],
+    arguments: dict[str, Any],
+    timeout_sec: float = 30,
+    max_output_bytes: int = 1048576,
+    pool: WorkerPool | None = None,
+) -> SubprocessResult:
+    """Call a tool function and return it like a finished command.
+
+    Coroutine functions run on the event loop. Plain functions run in a
+    thread, or in ``pool`` when given. A string return value is the output;
+    anything else is serialized as JSON. An exception exits with code 1 and
+    its message in ``stderr``, so retry and circuit breaker policies apply.
+
+    On timeout the call is abandoned, but a thread or worker process that is
+    already running the function can't be stopped and finishes in the
+    background.
+    """
+    if inspect.iscoroutinefunction(func):
+        call = func(**arguments)
+    elif pool is not None:
+        loop = asyncio.get_running_loop()
+        call = loop.run_in_executor(
+            pool.executor(), functools.partial(func, **arguments)
+        )
+    else:
+        call = asyncio.to_thread(func, **arguments)
+
+    with start_span("execute", {"code.function": func.__qualname__}) as span:
+        try:
+            value = await asyncio.wait_for(call, timeout=timeout_sec)
+        except TimeoutError:
+            raise TimeoutError(
+                f"Function timed out after {timeout_sec} seconds"
+            ) from None
+        except Exception as e:
+            span.record_exception(e)
+            return SubprocessResult("", f"{type(e).__name__}: {e}", 1)
+
+        if value is None:
+            output = ""
+        elif isinstance(value, str):
+            output = value
+        else:
+            output = json.dumps(value, default=str)
+
+        truncated = len(output) > max_output_bytes
+        span.set_attributes(
+            {"output.bytes": len(output), "output.truncated": truncated}
+        )
+        if truncated:
+            output = output[:max_output_bytes] + "\n[OUTPUT TRUNCATED]"
+
+    return SubprocessResult(output, "", 0, truncated)
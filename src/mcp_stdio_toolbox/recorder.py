@@ -0,0 +1,96 @@
+"""Record tool calls to a compact log for offline replay."""
+
+import json
+import logging
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, TextIO
+
+from .config_loader import RecordingConfig
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "[REDACTED]"
+
+
+@dataclass
+class CallRecord:
+    """One recorded call; field names match the short keys in the log."""
+
+    t: float  # arrival, seconds since the epoch
+    tool: str
+    args: dict[str, Any]
+    ms: float  # latency from arrival to response
+    bytes: int  # output size
+    ok: bool = True
+    service_ms: float | None = None  # time the tool held a slot, if it ran
+    error: str | None = None  # circuit_open, invalid, dropped or error
+
+
+def redact(value: Any, patterns: list[str]) -> Any:
+    """Replace values whose key matches a pattern, at any depth.
+
+    Patterns are shell-style globs matched case-insensitively against keys.
+    """
+    if isinstance(value, dict):
+        return {
+            key: REDACTED
+            if any(fnmatchcase(str(key).lower(), p.lower()) for p in patterns)
+            else redact(item, patterns)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item, patterns) for item in value]
+    return value
+
+
+class CallRecorder:
+    """Appends one JSON line per call to the recording file."""
+
+    def __init__(self, config: RecordingConfig):
+        self.config = config
+        self.path = Path(config.path)
+        self._file: TextIO | None = None
+
+    def record(
+        self,
+        tool: str,
+        arguments: dict[str, Any],
+        arrival: float,
+        latency_sec: float,
+        output_bytes: int,
+        service_sec: float = 0.0,
+        error: str | None = None,
+    ):
+        entry = {
+            "t": round(arrival, 6),
+            "tool": tool,
+            "args": redact(arguments, self.config.redact),
+            "ms": round(latency_sec * 1000, 3),
+            "bytes": output_bytes,
+            "ok": error is None,
+            "service_ms": round(service_sec * 1000, 3),
+        }
+        if error is not None:
+            entry["error"] = error
+        # Recording must never fail a call, so write errors are only logged.
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", buffering=1)
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Can't record call to {tool}: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_records(path: str | Path) -> list[CallRecord]:
+    """Load a recording, ordered by arrival time."""
+    with open(path) as f:
+        records = [CallRecord(**json.loads(line)) for line in f if line.strip()]
+    records.sort(key=lambda record: record.t)
+    return records
@@ -0,0 +1,267 @@
+"""Replay recorded tool calls against a server to load test a configuration."""
+
+import asyncio
+import dataclasses
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import click
+
+from .config_loader import Config
+from .metrics import LatencyTracker
+from .recorder import CallRecord, read_records
+
+STUB_FUNCTION = "mcp_stdio_toolbox.replay:stub_tool"
+STUB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ms": {"type": "number", "minimum": 0},
+        "bytes": {"type": "integer", "minimum": 0},
+        "ok": {"type": "boolean"},
+    },
+}
+# Recorded failures that never reached the tool, so stubs don't replay them.
+REJECTIONS = ("circuit_open", "invalid")
+
+
+async def stub_tool(ms: float = 0, bytes: int = 0, ok: bool = True) -> str:
+    """Take ``ms`` milliseconds and return ``bytes`` of output, or fail."""
+    await asyncio.sleep(ms / 1000)
+    if not ok:
+        raise RuntimeError("Recorded call failed")
+    return "x" * bytes
+
+
+def stub_tools(config: Config) -> Config:
+    """Swap every tool for the stub, keeping its scheduling and policies.
+
+    Classes, priorities, timeouts, retries and circuit breakers still apply,
+    so a replay shows how the configured limits handle the recorded load.
+    """
+    tools = [
+        dataclasses.replace(
+            tool,
+            tool_type="python",
+            function=STUB_FUNCTION,
+            command="",
+            args=[],
+            input_schema=STUB_SCHEMA,
+            stdin_from=None,
+            warmup=None,
+            http=None,
+            cpu_bound=False,
+        )
+        for tool in config.tools
+    ]
+    return dataclasses.replace(config, tools=tools)
+
+
+@dataclass
+class ReplayedCall:
+    tool: str
+    latency_sec: float
+    ok: bool
+    rejected: bool = False
+
+
+async def replay(
+    session: Any,
+    records: list[CallRecord],
+    speed: float | None = 1.0,
+    concurrency: int = 16,
+    stub: bool = True,
+) -> tuple[list[ReplayedCall], float]:
+    """Send the recorded calls through an MCP client session.
+
+    With a ``speed`` the original arrival times are kept, divided by the
+    speed factor. With ``speed=None`` calls are sent as fast as possible,
+    ``concurrency`` at a time. Returns the calls and the wall time.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    if speed is None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(record: CallRecord) -> ReplayedCall:
+            async with semaphore:
+                return await _call(session, record, stub)
+
+        calls = await asyncio.gather(*(bounded(record) for record in records))
+        return list(calls), loop.time() - start
+
+    tasks = []
+    first = records[0].t if records else 0.0
+    for record in records:
+        delay = (record.t - first) / speed - (loop.time() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_call(session, record, stub)))
+    calls = await asyncio.gather(*tasks)
+    return list(calls), loop.time() - start
+
+
+async def _call(session: Any, record: CallRecord, stub: bool) -> ReplayedCall:
+    arguments = record.args
+    if stub:
+        if record.error in REJECTIONS:
+            # Turned away before running; replaying it as a failure would
+            # count against the tool's circuit breaker.
+            return ReplayedCall(record.tool, 0.0, False, rejected=True)
+        # The stub takes the slot time only; queueing and backoff come from
+        # the replayed dispatcher. A dropped call never ran, so it gets
+        # another chance.
+        ms = record.ms if record.service_ms is None else record.service_ms
+        ok = record.ok or record.error == "dropped"
+        arguments = {"ms": ms, "bytes": record.bytes, "ok": ok}
+
+    start = time.monotonic()
+    result = await session.call_tool(record.tool, arguments)
+    latency = time.monotonic() - start
+
+    text = "".join(getattr(item, "text", "") for item in result.content)
+    failed = result.isError or text.startswith(("Error:", '{"error"'))
+    return ReplayedCall(record.tool, latency, not failed)
+
+
+def summarize(
+    calls: list[ReplayedCall], duration_sec: float, records: list[CallRecord]
+) -> dict[str, Any]:
+    """Latency percentiles and throughput of a replay, next to the recording.
+
+    Rejected calls are counted apart and left out of errors and latencies.
+    """
+    window = max(1, len(calls))
+    replayed = LatencyTracker(window)
+    recorded = LatencyTracker(window)
+    per_tool: dict[str, LatencyTracker] = {}
+    for call in calls:
+        if call.rejected:
+            continue
+        replayed.record(call.latency_sec)
+        per_tool.setdefault(call.tool, LatencyTracker(window)).record(call.latency_sec)
+    recorded_errors = recorded_rejected = 0
+    for record in records:
+        if record.error in REJECTIONS:
+            recorded_rejected += 1
+            continue
+        recorded_errors += not record.ok
+        recorded.record(record.ms / 1000)
+
+    return {
+        "calls": len(calls),
+        "errors": sum(not call.ok and not call.rejected for call in calls),
+        "recorded_errors": recorded_errors,
+        "rejected": sum(call.rejected for call in calls),
+        "recorded_rejected": recorded_rejected,
+        "duration_sec": duration_sec,
+        "throughput_per_sec": len(calls) / duration_sec if duration_sec else None,
+        "latency": replayed.summary(),
+        "recorded_latency": recorded.summary(),
+        "tools": {name: tracker.summary() for name, tracker in per_tool.items()},
+    }
+
+
+async def replay_log(
+    config_path: str,
+    records: list[CallRecord],
+    speed: float | None = 1.0,
+    concurrency: int = 16,
+    stub: bool = True,
+) -> dict[str, Any]:
+    """Start a server for ``config_path`` over stdio and replay into it."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    server_args = ["-c", "from mcp_stdio_toolbox.server import main; main()"]
+    # The server under test mustn't append the replay to a recording.
+    server_args += ["--config", config_path, "--no-record"]
+    if stub:
+        server_args.append("--replay-stubs")
+    params = StdioServerParameters(
+        command=sys.executable, args=server_args, env=dict(os.environ)
+    )
+
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            # The client looks up tool schemas once; keep that out of the timings.
+            await session.list_tools()
+            calls, duration = await replay(session, records, speed, concurrency, stub)
+
+    return summarize(calls, duration, records)
+
+
+def format_report(summary: dict[str, Any]) -> str:
+    lines = [
+        f"calls {summary['calls']}  errors {summary['errors']} "
+        f"(recorded {summary['recorded_errors']})  "
+        f"rejected {summary['rejected']} "
+        f"(recorded {summary['recorded_rejected']})  "
+        f"duration {summary['duration_sec']:.2f} s  "
+        f"throughput {summary['throughput_per_sec'] or 0:.1f} calls/s",
+        "",
+        f"{'latency (ms)':<24}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+    ]
+    rows = [("recorded", summary["recorded_latency"]), ("replayed", summary["latency"])]
+    rows += [(f"  {name}", stats) for name, stats in sorted(summary["tools"].items())]
+    for label, stats in rows:
+        values = "".join(
+            f"{stats[key] * 1000:10.1f}" if stats[key] is not None else f"{'-':>10}"
+            for key in ("p50", "p95", "p99", "max")
+        )
+        lines.append(f"{label:<24}{stats['count']:>7}{values}")
+    return "\n".join(lines)
+
+
+@click.command()
+@click.argument("log", type=click.Path(exists=True, dir_okay=False))
+@click.option("--config", "-c", required=True, help="Configuration to replay against")
+@click.option(
+    "--speed",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Speed factor for the recorded arrival times (2 = twice as fast)",
+)
+@click.option("--max-speed", is_flag=True, help="Ignore arrival times")
+@click.option(
+    "--concurrency",
+    type=int,
+    default=16,
+    show_default=True,
+    help="Calls in flight with --max-speed",
+)
+@click.option(
+    "--stub/--real",
+    default=True,
+    show_default=True,
+    help="Replace tools with stubs that mimic recorded latency and output size",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the summary as JSON")
+def main(
+    log: str,
+    config: str,
+    speed: float,
+    max_speed: bool,
+    concurrency: int,
+    stub: bool,
+    as_json: bool,
+):
+    """Replay a call recording against a toolbox server and report latency."""
+    if speed <= 0:
+        raise click.BadParameter("must be positive", param_hint="--speed")
+
+    records = read_records(log)
+    summary = asyncio.run(
+        replay_log(config, records, None if max_speed else speed, concurrency, stub)
+    )
+    click.echo(json.dumps(summary, indent=2) if as_json else format_report(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Retry and hedging policies for idempotent tools."""
+
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+
+from .config_loader import RetryPolicy, ToolConfig
+from .metrics import Metrics
+from .scheduler import QueueDeadlineError
+from .subprocess_runner import SubprocessResult
+
+logger = logging.getLogger(__name__)
+
+Attempt = Callable[[], Awaitable[SubprocessResult]]
+
+
+def backoff_delay(policy: RetryPolicy, retry_number: int) -> float:
+    """Exponential backoff for the given retry (1-based), with full jitter."""
+    delay = min(
+        policy.backoff_max_sec, policy.backoff_base_sec * 2 ** (retry_number - 1)
+    )
+    if policy.jitter:
+        delay = random.uniform(0, delay)
+    return delay
+
+
+async def run_with_retries(
+    tool_config: ToolConfig, attempt: Attempt, metrics: Metrics
+) -> SubprocessResult:
+    """Run ``attempt`` under the tool's retry and hedge policies.
+
+    Non-idempotent tools, and tools without a policy, run exactly once.
+    Each attempt, hedges included, should take its own dispatcher slot, so
+    that backoff sleeps don't hold one. Calls shed by the dispatcher are not
+    retried.
+    """
+    if not tool_config.idempotent:
+        return await attempt()
+
+    policy = tool_config.retry or RetryPolicy(max_attempts=1)
+    attempt_number = 1
+    while True:
+        last_attempt = attempt_number >= policy.max_attempts
+        try:
+            result = await _run_hedged(tool_config, attempt, metrics)
+        except QueueDeadlineError:
+            raise
+        except TimeoutError:
+            if last_attempt or not policy.retry_on_timeout:
+                raise
+            reason = "timeout"
+        else:
+            if last_attempt or result.exit_code not in policy.retry_on_exit_codes:
+                return result
+            reason = f"exit code {result.exit_code}"
+
+        delay = backoff_delay(policy, attempt_number)
+        metrics.incr(f"retries.{tool_config.name}")
+        logger.info(
+            f"Retrying {tool_config.name} after {reason} "
+            f"(attempt {attempt_number + 1}/{policy.max_attempts}, "
+            f"backoff {delay:.2f}s)"
+        )
+        await asyncio.sleep(delay)
+        attempt_number += 1
+
+
+async def _run_hedged(
+    tool_config: ToolConfig, attempt: Attempt, metrics: Metrics
+) -> SubprocessResult:
+    """Run one attempt, racing a second copy once it outlives the hedge delay."""
+    tracker = metrics.latency(f"attempt.{tool_config.name}")
+    hedge = tool_config.hedge
+    hedge_delay = None
+    if hedge and len(tracker.samples) >= hedge.min_samples:
+        hedge_delay = tracker.percentile(hedge.percentile)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    primary = asyncio.ensure_future(attempt())
+    secondary = None
+    done: set[asyncio.Task[SubprocessResult]] = set()
+    pending = {primary}
+    try:
+        if hedge_delay is not None:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if not done:
+                metrics.incr(f"hedges.{tool_config.name}")
+                secondary = asyncio.ensure_future(attempt())
+                pending.add(secondary)
+
+        while True:
+            # The primary may already have finished within the hedge delay.
+            if not done:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            winner = next((task for task in done if task.exception() is None), None)
+            if winner is None and pending:
+                # One copy failed; the other may still succeed.
+                done = set()
+                continue
+            winner = winner or done.pop()
+            if winner is secondary:
+                metrics.incr(f"hedge_wins.{tool_config.name}")
+            tracker.record(loop.time() - start)
+            return winner.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,229 @@
+"""Weighted-fair dispatcher that sits in front of tool handlers."""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from .config_loader import SchedulingConfig, ToolConfig
+from .metrics import Metrics
+from .tracing import start_span
+
+T = TypeVar("T")
+
+INTERACTIVE_CLASS = "interactive"
+
+
+class QueueDeadlineError(TimeoutError):
+    """Raised when a queued call is dropped because its timeout can't be met."""
+
+
+@dataclass
+class CallTiming:
+    """Time one request spent queued and holding slots, over all its attempts."""
+
+    queue_sec: float = 0.0
+    service_sec: float = 0.0
+
+
+_call_timing: ContextVar[CallTiming | None] = ContextVar("call_timing", default=None)
+
+
+@contextmanager
+def timed_call() -> Iterator[CallTiming]:
+    """Add up the dispatcher time of everything run inside the block.
+
+    Tasks started inside the block, such as hedged attempts, count too.
+    """
+    timing = CallTiming()
+    token = _call_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _call_timing.reset(token)
+
+
+@dataclass(order=True)
+class _Waiter:
+    sort_key: tuple[int, int]
+    tool_name: str = field(compare=False)
+    tool_class: str = field(compare=False)
+    deadline: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class Dispatcher:
+    """Admit tool calls under a global concurrency limit.
+
+    Calls are grouped by their tool class. When the limit is reached, waiting
+    classes are served by stride scheduling so each class gets a share of the
+    slots proportional to its weight; within a class, higher ``priority`` goes
+    first. ``reserved_interactive`` slots are never handed to other classes.
+    """
+
+    def __init__(self, config: SchedulingConfig, metrics: Metrics | None = None):
+        self.config = config
+        self.metrics = metrics or Metrics()
+        self.running = 0
+        self.running_by_class: dict[str, int] = {}
+        self._queues: dict[str, list[_Waiter]] = {}
+        self._pass: dict[str, float] = {}
+        self._vtime = 0.0
+        self._seq = itertools.count()
+
+    async def run(self, tool_config: ToolConfig, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call`` once the tool's class is granted a slot."""
+        loop = asyncio.get_running_loop()
+        tool_class = tool_config.tool_class
+        start = loop.time()
+
+        if self.config.max_concurrency is not None:
+            with start_span("queue", {"tool.class": tool_class}):
+                await self._acquire(tool_config, start + tool_config.timeout_sec)
+        self._started(tool_class)
+        started = loop.time()
+        self.metrics.observe(f"queue_wait.{tool_class}", started - start)
+
+        try:
+            return await call()
+        finally:
+            end = loop.time()
+            self.metrics.observe(f"class.{tool_class}", end - start)
+            self.metrics.observe(f"tool.{tool_config.name}", end - start)
+            self.metrics.observe(f"service.{tool_config.name}", end - started)
+            timing = _call_timing.get()
+            if timing is not None:
+                timing.queue_sec += started - start
+                timing.service_sec += end - started
+            self._release(tool_class)
+
+    async def _acquire(self, tool_config: ToolConfig, deadline: float):
+        tool_class = tool_config.tool_class
+        if not self._queues.get(tool_class) and self._can_start(tool_class):
+            self._charge(tool_class)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            sort_key=(-tool_config.priority, next(self._seq)),
+            tool_name=tool_config.name,
+            tool_class=tool_class,
+            deadline=deadline,
+            future=loop.create_future(),
+        )
+        queue = self._queues.setdefault(tool_class, [])
+        if not queue:
+            # A class that was idle must not bank credit from its idle time.
+            self._pass[tool_class] = max(self._pass.get(tool_class, 0.0), self._vtime)
+        heapq.heappush(queue, waiter)
+        self.metrics.set_gauge(f"queue_depth.{tool_class}", len(queue))
+
+        budget = None
+        if self.config.drop_unmeetable_deadlines:
+            budget = max(0.0, deadline - self._expected_latency(waiter) - loop.time())
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), budget)
+        except QueueDeadlineError:
+            raise
+        except (TimeoutError, asyncio.CancelledError) as e:
+            cancelled = isinstance(e, asyncio.CancelledError)
+            if waiter.future.done() and not waiter.future.cancelled():
+                error = waiter.future.exception()
+                if error is None:
+                    # The slot was granted while we were giving up on it.
+                    if not cancelled:
+                        return
+                    self._release(tool_class)
+                elif not cancelled:
+                    # Dropped by _dispatch in the same tick; no slot was taken.
+                    raise error from None
+            else:
+                waiter.future.cancel()
+            if cancelled:
+                raise
+            self.metrics.incr(f"dropped.{tool_class}")
+            raise QueueDeadlineError(
+                f"Dropped from queue: {tool_config.name} can't finish within "
+                f"{tool_config.timeout_sec} seconds"
+            ) from None
+
+    def _can_start(self, tool_class: str) -> bool:
+        limit = self.config.max_concurrency
+        if limit is None:
+            return True
+        if self.running >= limit:
+            return False
+        if tool_class == INTERACTIVE_CLASS:
+            return True
+        others = self.running - self.running_by_class.get(INTERACTIVE_CLASS, 0)
+        return others < limit - self.config.reserved_interactive
+
+    def _charge(self, tool_class: str):
+        weight = self.config.class_weights.get(tool_class, 1)
+        self._pass[tool_class] = max(self._pass.get(tool_class, 0.0), self._vtime)
+        self._vtime = self._pass[tool_class]
+        self._pass[tool_class] += 1 / weight
+        self.running += 1
+        self.running_by_class[tool_class] = self.running_by_class.get(tool_class, 0) + 1
+
+    def _started(self, tool_class: str):
+        if self.config.max_concurrency is None:
+            self.running += 1
+            self.running_by_class[tool_class] = (
+                self.running_by_class.get(tool_class, 0) + 1
+            )
+        self.metrics.set_gauge(
+            f"running.{tool_class}", self.running_by_class[tool_class]
+        )
+
+    def _release(self, tool_class: str):
+        self.running -= 1
+        self.running_by_class[tool_class] -= 1
+        self.metrics.set_gauge(
+            f"running.{tool_class}", self.running_by_class[tool_class]
+        )
+        self._dispatch()
+
+    def _expected_latency(self, waiter: _Waiter) -> float:
+        # Service time only: counting queue wait would make drops feed on
+        # the congestion they are meant to relieve.
+        tracker = self.metrics.latency(f"service.{waiter.tool_name}")
+        return tracker.percentile(50) or 0.0
+
+    def _dispatch(self):
+        """Hand free slots to waiters, lowest virtual pass first."""
+        loop = asyncio.get_running_loop()
+        while True:
+            candidates = []
+            for tool_class, queue in self._queues.items():
+                while queue and queue[0].future.done():
+                    heapq.heappop(queue)
+                if queue and self._can_start(tool_class):
+                    candidates.append((self._pass[tool_class], tool_class))
+            if not candidates:
+                break
+
+            _, tool_class = min(candidates)
+            queue = self._queues[tool_class]
+            waiter = heapq.heappop(queue)
+            self.metrics.set_gauge(f"queue_depth.{tool_class}", len(queue))
+
+            if self.config.drop_unmeetable_deadlines and (
+                loop.time() + self._expected_latency(waiter) > waiter.deadline
+            ):
+                self.metrics.incr(f"dropped.{tool_class}")
+                waiter.future.set_exception(
+                    QueueDeadlineError(
+                        f"Dropped from queue: {waiter.tool_name} can't finish "
+                        "before its timeout"
+                    )
+                )
+                continue
+
+            self._charge(tool_class)
+            waiter.future.set_result(None)
@@ -1,7 +1,10 @@
 """Main MCP server for stdio toolbox."""
 
 import asyncio
+import json
 import logging
+import sys
+import time
 from typing import Any
 
 import click
@@ -11,27 +14,103 @@ from mcp.server.stdio import stdio_server
 from mcp.types import (
     TextContent,
     Tool,
+    ToolAnnotations,
 )
 
+from .circuit_breaker import CircuitOpenError
 from .config_loader import load_config
+from .recorder import CallRecorder
+from .replay import stub_tools
+from .scheduler import QueueDeadlineError, timed_call
 from .tool_registry import ToolRegistry
+from .tracing import configure_tracing, start_span
 
 logger = logging.getLogger(__name__)
 
 # Global registry
 registry = ToolRegistry()
 
+METRICS_TOOL_NAME = "toolbox_metrics"
+
 
 @click.command()
 @click.option(
     "--config", "-c", default="config/tools.yaml", help="Path to configuration file"
 )
-def main(config: str):
+@click.option(
+    "--check", is_flag=True, help="Validate the configuration, probe tools and exit"
+)
+@click.option(
+    "--replay-stubs",
+    is_flag=True,
+    help="Replace every tool with a stub that mimics recorded calls",
+)
+@click.option(
+    "--no-record", is_flag=True, help="Don't record calls, even if configured to"
+)
+def main(config: str, check: bool, replay_stubs: bool, no_record: bool):
     """Start MCP stdio toolbox server."""
-    asyncio.run(serve(config))
+    if check:
+        sys.exit(asyncio.run(check_config(config)))
+    asyncio.run(serve(config, replay_stubs, record=not no_record))
+
+
+async def check_config(config_path: str) -> int:
+    """Validate configuration and probe every tool; return an exit code."""
+    try:
+        config = load_config(config_path)
+    except Exception as e:
+        click.echo(f"Invalid configuration: {e}", err=True)
+        return 1
+
+    registry.configure(config.server)
+    for tool_config in config.tools:
+        registry.register_tool(tool_config)
+
+    results = await registry.warm_up()
+    for result in results:
+        # Handlers are otherwise built on a tool's first call; build them now
+        # so schema errors fail the check instead of that call.
+        try:
+            registry.get_handler(result.tool)
+        except Exception as e:
+            # Schema errors carry a one-line message next to a long dump
+            message = getattr(e, "message", e)
+            result.healthy = False
+            result.error = "; ".join(
+                filter(None, [result.error, f"Invalid: {message}"])
+            )
+
+        status = "ok" if result.healthy else "FAIL"
+        line = f"{status:<4} {result.tool}"
+        if result.latency_sec is not None:
+            line += f" ({result.latency_sec * 1000:.0f} ms)"
+        if result.error:
+            line += f": {result.error}"
+        click.echo(line)
 
+    unhealthy = sum(not result.healthy for result in results)
+    click.echo(f"{len(results) - unhealthy}/{len(results)} tools healthy")
+    return 1 if unhealthy else 0
 
-async def serve(config_path: str):
+
+def _failure_kind(error: Exception) -> str:
+    """Classify a failed call for the recording."""
+    # Unknown tools and invalid arguments are rejected before anything runs;
+    # failures while running reach the server as RuntimeError.
+    if isinstance(error, ValueError):
+        return "invalid"
+    if isinstance(error.__cause__, QueueDeadlineError):
+        return "dropped"
+    return "error"
+
+
+def _log_warmup_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Tool warm-up failed: {task.exception()!r}")
+
+
+async def serve(config_path: str, replay_stubs: bool = False, record: bool = True):
     """Serve the MCP server."""
     # Load configuration
     try:
@@ -41,11 +120,25 @@ async def serve(config_path: str):
         logger.error(f"Failed to load configuration: {e}")
         return
 
+    if replay_stubs:
+        config = stub_tools(config)
+        logger.info("Serving replay stubs instead of the configured tools")
+
+    tracer = configure_tracing(config.server.tracing)
+    recorder = None
+    if record and config.server.recording.enabled:
+        recorder = CallRecorder(config.server.recording)
+
     # Register tools
+    registry.configure(config.server)
     for tool_config in config.tools:
         registry.register_tool(tool_config)
         logger.info(f"Registered tool: {tool_config.name}")
 
+    # Probe tools in the background so the MCP handshake isn't delayed
+    warmup_task = asyncio.create_task(registry.warm_up())
+    warmup_task.add_done_callback(_log_warmup_failure)
+
     # Create server
     server = Server(config.server.name)
 
@@ -54,11 +147,21 @@ async def serve(config_path: str):
         """List available tools."""
         tools = []
         for definition in registry.get_tool_definitions():
+            annotations = definition.get("annotations")
             tools.append(
                 Tool(
                     name=definition["name"],
                     description=definition["description"],
                     inputSchema=definition["inputSchema"],
+                    annotations=ToolAnnotations(**annotations) if annotations else None,
+                )
+            )
+        if config.server.expose_metrics:
+            tools.append(
+                Tool(
+                    name=METRICS_TOOL_NAME,
+                    description="Report toolbox latency, queue and error metrics",
+                    inputSchema={"type": "object", "properties": {}},
                 )
             )
         return tools
@@ -71,21 +174,56 @@ async def serve(config_path: str):
         if arguments is None:
             arguments = {}
 
-        try:
-            handler = registry.get_handler(name)
-            result = await handler(arguments)
-
-            # Convert to TextContent
-            text_content = []
-            for item in result:
-                if item["type"] == "text":
-                    text_content.append(TextContent(type="text", text=item["text"]))
-
-            return text_content
-
-        except Exception as e:
-            logger.error(f"Tool execution failed for {name}: {e}")
-            return [TextContent(type="text", text=f"Error: {e}")]
+        if config.server.expose_metrics and name == METRICS_TOOL_NAME:
+            snapshot = registry.metrics.snapshot()
+            return [TextContent(type="text", text=json.dumps(snapshot, indent=2))]
+
+        arrival = time.time()
+        start = time.monotonic()
+        error = None
+        with (
+            start_span("tools/call", {"tool.name": name}) as span,
+            timed_call() as timing,
+        ):
+            if span.is_recording():
+                request_id = server.request_context.request_id
+                span.set_attribute("mcp.request.id", str(request_id))
+
+            try:
+                handler = registry.get_handler(name)
+                result = await handler(arguments)
+
+                # Convert to TextContent
+                with start_span("respond"):
+                    content = []
+                    for item in result:
+                        if item["type"] == "text":
+                            content.append(TextContent(type="text", text=item["text"]))
+
+            except CircuitOpenError as e:
+                span.record_exception(e)
+                logger.warning(str(e))
+                content = [TextContent(type="text", text=json.dumps(e.to_dict()))]
+                error = "circuit_open"
+
+            except Exception as e:
+                span.record_exception(e)
+                logger.error(f"Tool execution failed for {name}: {e}")
+                content = [TextContent(type="text", text=f"Error: {e}")]
+                error = _failure_kind(e)
+
+        if recorder is not None:
+            output_bytes = sum(len(item.text.encode("utf-8")) for item in content)
+            recorder.record(
+                name,
+                arguments,
+                arrival,
+                time.monotonic() - start,
+                output_bytes,
+                timing.service_sec,
+                error,
+            )
+        return content
 
     # Run server
     async with stdio_server() as (read_stream, write_stream):
@@ -99,6 +237,12 @@ async def serve(config_path: str):
             ),
         )
 
+    warmup_task.cancel()
+    await registry.aclose()
+    tracer.shutdown()
+    if recorder is not None:
+        recorder.close()
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
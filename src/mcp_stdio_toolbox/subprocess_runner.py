@@ -1,8 +1,14 @@
 """Async subprocess runner for executing CLI tools."""
 
 import asyncio
+import json
 from typing import Any
 
+from .tracing import start_span
+
+# ``stdin_from`` value that sends all arguments to stdin as one JSON object
+STDIN_ALL_ARGUMENTS = "*"
+
 
 class SubprocessResult:
     def __init__(
@@ -19,34 +25,56 @@ async def run_command(
     args: list[str],
     timeout_sec: int = 30,
     max_output_bytes: int = 1048576,
+    stdin_data: bytes | None = None,
 ) -> SubprocessResult:
-    """Run a command with arguments and return the result."""
+    """Run a command with arguments and return the result.
+
+    ``stdin_data`` is written to the child's stdin while its output is read,
+    so large payloads can't deadlock on full pipes. Without it the child gets
+    an empty stdin rather than inheriting the server's protocol stream.
+    """
+    stdin = asyncio.subprocess.PIPE
+    if stdin_data is None:
+        stdin = asyncio.subprocess.DEVNULL
     try:
-        process = await asyncio.create_subprocess_exec(
-            command,
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        stdout_bytes, stderr_bytes = await asyncio.wait_for(
-            process.communicate(), timeout=timeout_sec
-        )
-
-        stdout = stdout_bytes.decode("utf-8", errors="replace")
-        stderr = stderr_bytes.decode("utf-8", errors="replace")
-
-        # Truncate output if too large
-        truncated = False
-        if len(stdout) > max_output_bytes:
-            stdout = stdout[:max_output_bytes] + "\n[OUTPUT TRUNCATED]"
-            truncated = True
-
-        if len(stderr) > max_output_bytes:
-            stderr = stderr[:max_output_bytes] + "\n[OUTPUT TRUNCATED]"
-            truncated = True
-
-        return SubprocessResult(stdout, stderr, process.returncode or 0, truncated)
+        with start_span("spawn", {"process.command": command}) as span:
+            process = await asyncio.create_subprocess_exec(
+                command,
+                *args,
+                stdin=stdin,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            span.set_attribute("process.pid", process.pid)
+
+        with start_span("execute", {"process.pid": process.pid}) as span:
+            stdout_bytes, stderr_bytes = await asyncio.wait_for(
+                process.communicate(stdin_data), timeout=timeout_sec
+            )
+
+            stdout = stdout_bytes.decode("utf-8", errors="replace")
+            stderr = stderr_bytes.decode("utf-8", errors="replace")
+
+            # Truncate output if too large
+            truncated = False
+            if len(stdout) > max_output_bytes:
+                stdout = stdout[:max_output_bytes] + "\n[OUTPUT TRUNCATED]"
+                truncated = True
+
+            if len(stderr) > max_output_bytes:
+                stderr = stderr[:max_output_bytes] + "\n[OUTPUT TRUNCATED]"
+                truncated = True
+
+            exit_code = process.returncode or 0
+            span.set_attributes(
+                {
+                    "process.exit.code": exit_code,
+                    "output.bytes": len(stdout_bytes),
+                    "output.truncated": truncated,
+                }
+            )
+
+        return SubprocessResult(stdout, stderr, exit_code, truncated)
 
     except TimeoutError:
         try:
@@ -56,6 +84,15 @@ async def run_command(
             pass
         raise TimeoutError(f"Command timed out after {timeout_sec} seconds") from None
 
+    except asyncio.CancelledError:
+        # Don't leave the child running when the caller gives up on it.
+        try:
+            process.kill()
+            await process.wait()
+        except Exception:
+            pass
+        raise
+
     except FileNotFoundError as e:
         raise FileNotFoundError(f"Command not found: {command}") from e
 
@@ -75,3 +112,31 @@ def build_command_args(
                 final_args.append(str(inputs[key]))
 
     return final_args
+
+
+def build_stdin_payload(stdin_from: str | None, inputs: dict[str, Any]) -> bytes | None:
+    """Build the bytes sent to a tool's stdin, or None for argv-only tools.
+
+    ``stdin_from`` names the input property to send; strings are sent as-is
+    and other values JSON-encoded. ``"*"`` sends all inputs as a JSON object.
+    """
+    if stdin_from is None:
+        return None
+    if stdin_from == STDIN_ALL_ARGUMENTS:
+        return json.dumps(inputs).encode("utf-8")
+    if stdin_from not in inputs:
+        return b""
+
+    value = inputs[stdin_from]
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return value.encode("utf-8")
+
+
+def argv_inputs(stdin_from: str | None, inputs: dict[str, Any]) -> dict[str, Any]:
+    """Return the inputs left for argv once the stdin payload is taken out."""
+    if stdin_from is None:
+        return inputs
+    if stdin_from == STDIN_ALL_ARGUMENTS:
+        return {}
+    return {key: value for key, value in inputs.items() if key != stdin_from}
@@ -1,46 +1,155 @@
 """Dynamic tool registry for MCP server."""
 
-from collections.abc import Callable
+import asyncio
+from collections.abc import Callable, Iterator, Mapping
 from typing import Any
 
-from jsonschema import ValidationError, validate
+from jsonschema import ValidationError, validators
 
-from .config_loader import ToolConfig
-from .subprocess_runner import build_command_args, run_command
+from .circuit_breaker import CircuitBreaker
+from .config_loader import SchedulingConfig, ServerConfig, ToolConfig
+from .http_tool import HttpClientPool, run_http_request
+from .metrics import Metrics
+from .python_tool import WorkerPool, load_function, run_function
+from .retry import Attempt, run_with_retries
+from .scheduler import Dispatcher, QueueDeadlineError
+from .subprocess_runner import (
+    SubprocessResult,
+    argv_inputs,
+    build_command_args,
+    build_stdin_payload,
+    run_command,
+)
+from .tracing import start_span
+from .warmup import ProbeResult, probe_tools
+
+
+class LazyHandlers(Mapping[str, Callable]):
+    """Handlers keyed by tool name, each built on first lookup.
+
+    Registering hundreds of tools only stores their configs; the handler,
+    its compiled validator and argument plan are created when a tool is first
+    called.
+    """
+
+    def __init__(self, registry: "ToolRegistry"):
+        self._registry = registry
+        self._built: dict[str, Callable] = {}
+
+    def __getitem__(self, tool_name: str) -> Callable:
+        if tool_name not in self._built:
+            tool_config = self._registry.tools[tool_name]
+            self._built[tool_name] = self._registry._create_handler(tool_config)
+        return self._built[tool_name]
+
+    def __contains__(self, tool_name: object) -> bool:
+        return tool_name in self._registry.tools
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.tools)
+
+    def __len__(self) -> int:
+        return len(self._registry.tools)
+
+    def is_built(self, tool_name: str) -> bool:
+        return tool_name in self._built
+
+    def discard(self, tool_name: str):
+        self._built.pop(tool_name, None)
 
 
 class ToolRegistry:
     def __init__(self):
         self.tools: dict[str, ToolConfig] = {}
-        self.handlers: dict[str, Callable] = {}
+        self.handlers = LazyHandlers(self)
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.health: dict[str, bool] = {}
+        self.metrics = Metrics()
+        self.dispatcher = Dispatcher(SchedulingConfig(), self.metrics)
+        self.http_pool = HttpClientPool()
+        self.worker_pool = WorkerPool()
+        self.max_output_bytes = ServerConfig().max_output_bytes
+
+    def configure(self, server_config: ServerConfig):
+        """Apply server-wide settings such as scheduling limits."""
+        self.dispatcher = Dispatcher(server_config.scheduling, self.metrics)
+        self.http_pool = HttpClientPool(server_config.http)
+        self.max_output_bytes = server_config.max_output_bytes
+
+    async def aclose(self):
+        """Release shared resources such as pooled HTTP connections."""
+        await self.http_pool.aclose()
+        self.worker_pool.shutdown()
 
     def register_tool(self, tool_config: ToolConfig):
         """Register a tool from configuration."""
         self.tools[tool_config.name] = tool_config
-        self.handlers[tool_config.name] = self._create_handler(tool_config)
+        self.handlers.discard(tool_config.name)
+        if tool_config.circuit_breaker:
+            self.breakers[tool_config.name] = CircuitBreaker(
+                tool_config.name, tool_config.circuit_breaker, self.metrics
+            )
+        else:
+            self.breakers.pop(tool_config.name, None)
 
     def _create_handler(self, tool_config: ToolConfig):
         """Create an async handler for a tool."""
+        # Check and compile the schema once rather than on every call
+        validator_class = validators.validator_for(tool_config.input_schema)
+        validator_class.check_schema(tool_config.input_schema)
+        validator = validator_class(tool_config.input_schema)
+        arg_mapping = tool_config.input_schema.get("arg_mapping", [])
+        defaults = {
+            key: prop["default"]
+            for key, prop in tool_config.input_schema.get("properties", {}).items()
+            if isinstance(prop, dict) and "default" in prop
+        }
+        # Python tools import their function once, on the first call
+        function: Callable | None = None
 
         async def handler(arguments: dict[str, Any]) -> list[dict[str, Any]]:
+            nonlocal function
+
             # Validate input against schema
-            try:
-                validate(instance=arguments, schema=tool_config.input_schema)
-            except ValidationError as e:
-                raise ValueError(f"Invalid arguments: {e.message}") from e
+            with start_span("validate"):
+                try:
+                    validator.validate(arguments)
+                except ValidationError as e:
+                    raise ValueError(f"Invalid arguments: {e.message}") from e
 
-            # Build command arguments
-            arg_mapping = tool_config.input_schema.get("arg_mapping", [])
-            final_args = build_command_args(tool_config.args, arguments, arg_mapping)
+            if tool_config.tool_type == "python" and function is None:
+                assert tool_config.function
+                # In a thread, like the warm-up probe, so a slow import (or
+                # one waiting on the probe's import lock) doesn't stall the loop
+                try:
+                    function = await asyncio.to_thread(
+                        load_function, tool_config.function
+                    )
+                except Exception as e:
+                    raise RuntimeError(
+                        f"Can't import {tool_config.function}: {e}"
+                    ) from e
+
+            # Build the command line and stdin payload, or the in-process call
+            attempt = self._build_attempt(
+                tool_config, arguments, arg_mapping, defaults, function
+            )
+
+            # Fail fast while the tool's circuit is open
+            breaker = self.breakers.get(tool_config.name)
+            if breaker:
+                breaker.before_call()
 
             # Execute command
             try:
-                result = await run_command(
-                    tool_config.command, final_args, tool_config.timeout_sec
-                )
+                result = await self._execute(tool_config, attempt, breaker)
 
                 if result.exit_code != 0:
                     error_msg = f"Command failed (exit code {result.exit_code})"
+                    if tool_config.tool_type == "http":
+                        error_msg = f"HTTP request failed (status {result.exit_code})"
+                    elif tool_config.tool_type == "python":
+                        error_msg = "Function failed"
                     if result.stderr:
                         error_msg += f": {result.stderr}"
                     raise RuntimeError(error_msg)
@@ -61,17 +170,113 @@ class ToolRegistry:
 
         return handler
 
+    def _build_attempt(
+        self,
+        tool_config: ToolConfig,
+        arguments: dict[str, Any],
+        arg_mapping: list[list[str]],
+        defaults: dict[str, Any],
+        function: Callable | None = None,
+    ) -> Attempt:
+        """Bind validated arguments to a callable that runs the tool once."""
+        if tool_config.tool_type == "python":
+            assert function is not None
+            values = {**defaults, **arguments}
+            pool = self.worker_pool if tool_config.cpu_bound else None
+            return lambda: run_function(
+                function,
+                values,
+                tool_config.timeout_sec,
+                self.max_output_bytes,
+                pool,
+            )
+
+        if tool_config.tool_type == "http":
+            # The config loader requires an http block for http tools.
+            request = tool_config.http
+            assert request is not None
+            values = {**defaults, **arguments}
+            return lambda: run_http_request(
+                self.http_pool,
+                request,
+                values,
+                tool_config.timeout_sec,
+                self.max_output_bytes,
+            )
+
+        final_args = build_command_args(
+            tool_config.args,
+            argv_inputs(tool_config.stdin_from, arguments),
+            arg_mapping,
+        )
+        stdin_data = build_stdin_payload(tool_config.stdin_from, arguments)
+        return lambda: run_command(
+            tool_config.command,
+            final_args,
+            tool_config.timeout_sec,
+            self.max_output_bytes,
+            stdin_data=stdin_data,
+        )
+
+    async def _execute(
+        self,
+        tool_config: ToolConfig,
+        attempt: Attempt,
+        breaker: CircuitBreaker | None,
+    ) -> SubprocessResult:
+        """Run an admitted call and report its outcome to the circuit breaker.
+
+        Every attempt queues for its own dispatcher slot: backoff between
+        retries holds none, and a hedge counts against the concurrency limit.
+        """
+        try:
+            result = await run_with_retries(
+                tool_config,
+                lambda: self.dispatcher.run(tool_config, attempt),
+                self.metrics,
+            )
+        except QueueDeadlineError:
+            # Shed by the dispatcher; says nothing about the tool's health.
+            if breaker:
+                breaker.release()
+            raise
+        except Exception:
+            if breaker:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker:
+                breaker.release()
+            raise
+
+        if breaker:
+            breaker.record_exit_code(result.exit_code)
+        return result
+
+    async def warm_up(self) -> list[ProbeResult]:
+        """Probe all registered tools and remember which ones are healthy."""
+        results = await probe_tools(list(self.tools.values()), self.metrics)
+        for result in results:
+            self.health[result.tool] = result.healthy
+        return results
+
     def get_tool_definitions(self) -> list[dict[str, Any]]:
         """Get MCP tool definitions for all registered tools."""
         definitions = []
         for name, config in self.tools.items():
-            definitions.append(
-                {
-                    "name": name,
-                    "description": config.description,
-                    "inputSchema": config.input_schema,
-                }
-            )
+            definition = {
+                "name": name,
+                "description": config.description,
+                "inputSchema": config.input_schema,
+            }
+            annotations: dict[str, Any] = {}
+            if name in self.breakers:
+                annotations["circuitState"] = self.breakers[name].state
+            if name in self.health:
+                annotations["healthy"] = self.health[name]
+            if annotations:
+                definition["annotations"] = annotations
+            definitions.append(definition)
         return definitions
 
     def get_handler(self, tool_name: str) -> Callable:
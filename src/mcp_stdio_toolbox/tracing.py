@@ -0,0 +1,150 @@
+"""Request tracing with OpenTelemetry, or a no-op when it is unavailable."""
+
+import logging
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from .config_loader import TracingConfig
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopSpan:
+    """Span stand-in that ignores everything, shared by all disabled spans."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> Literal[False]:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]):
+        pass
+
+    def record_exception(self, exception: BaseException):
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Tracer that records nothing; the default until tracing is configured."""
+
+    def span(self, name: str, attributes: dict[str, Any] | None = None):
+        """Return a context manager for a span; entering it yields the span."""
+        return _NOOP_SPAN
+
+    def shutdown(self):
+        pass
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer backed by an OpenTelemetry SDK ``TracerProvider``."""
+
+    def __init__(self, provider: "TracerProvider"):
+        self.provider = provider
+        self._tracer = provider.get_tracer("mcp_stdio_toolbox")
+
+    def span(self, name: str, attributes: dict[str, Any] | None = None):
+        return self._tracer.start_as_current_span(name, attributes=attributes)
+
+    def shutdown(self):
+        self.provider.shutdown()
+
+
+_tracer = Tracer()
+
+
+def start_span(name: str, attributes: dict[str, Any] | None = None):
+    """Start a span on the current tracer, as a child of the active span."""
+    return _tracer.span(name, attributes)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Install ``tracer`` for all spans and return the previous one."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def configure_tracing(config: TracingConfig) -> Tracer:
+    """Create and install the tracer described by ``config``.
+
+    Falls back to the no-op tracer, with a warning, when tracing is enabled
+    but the OpenTelemetry SDK or the OTLP exporter isn't installed.
+    """
+    tracer = Tracer()
+    if config.enabled:
+        try:
+            tracer = _create_otel_tracer(config)
+        except ImportError as e:
+            logger.warning(
+                f"Tracing disabled, OpenTelemetry is not installed ({e}); "
+                "install mcp-stdio-toolbox[tracing]"
+            )
+    set_tracer(tracer)
+    return tracer
+
+
+def _create_otel_tracer(config: TracingConfig) -> OpenTelemetryTracer:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    exporter: SpanExporter
+    if config.exporter == "jsonl":
+        exporter = _jsonl_span_exporter(config.path)
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        exporter = OTLPSpanExporter(endpoint=config.endpoint)
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.service_name})
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return OpenTelemetryTracer(provider)
+
+
+def _jsonl_span_exporter(path: str | Path) -> "SpanExporter":
+    """Exporter that appends finished spans to ``path``, one JSON object per line.
+
+    Defined here because the SDK base class is only importable with tracing.
+    """
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonlSpanExporter(SpanExporter):
+        def __init__(self, path: Path):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence["ReadableSpan"]) -> SpanExportResult:
+            lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+            try:
+                with self._lock, open(self.path, "a") as f:
+                    f.write(lines)
+            except OSError as e:
+                logger.warning(f"Can't write spans to {self.path}: {e}")
+                return SpanExportResult.FAILURE
+            return SpanExportResult.SUCCESS
+
+    return JsonlSpanExporter(Path(path))
@@ -0,0 +1,95 @@
+"""Startup warm-up and health probing of configured tools."""
+
+import asyncio
+import logging
+import shutil
+import time
+from dataclasses import dataclass
+
+from .config_loader import ToolConfig
+from .metrics import Metrics
+from .python_tool import load_function
+from .subprocess_runner import run_command
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProbeResult:
+    tool: str
+    healthy: bool
+    latency_sec: float | None = None
+    exit_code: int | None = None
+    error: str | None = None
+
+
+async def probe_tool(tool_config: ToolConfig) -> ProbeResult:
+    """Probe one tool.
+
+    Tools with a ``warmup`` block run it and must exit with the expected code;
+    the run also warms the page cache and the tool's own caches. Other tools
+    only need their command to be found on ``PATH``. Python tools need their
+    function to import, which happens in a thread so a slow import doesn't
+    stall the event loop; HTTP tools have nothing to probe.
+    """
+    if tool_config.tool_type == "python":
+        # The config loader requires a function for python tools.
+        assert tool_config.function
+        try:
+            await asyncio.to_thread(load_function, tool_config.function)
+        except Exception as e:
+            return ProbeResult(tool_config.name, False, error=f"Can't import: {e}")
+        return ProbeResult(tool_config.name, True)
+    if tool_config.tool_type != "subprocess":
+        return ProbeResult(tool_config.name, True)
+
+    warmup = tool_config.warmup
+    if warmup is None:
+        if shutil.which(tool_config.command) is None:
+            error = f"Command not found: {tool_config.command}"
+            return ProbeResult(tool_config.name, False, error=error)
+        return ProbeResult(tool_config.name, True)
+
+    start = time.monotonic()
+    try:
+        result = await run_command(
+            tool_config.command,
+            warmup.args,
+            warmup.timeout_sec or tool_config.timeout_sec,
+        )
+    except Exception as e:
+        return ProbeResult(tool_config.name, False, error=str(e))
+
+    latency = time.monotonic() - start
+    if result.exit_code != warmup.expected_exit_code:
+        return ProbeResult(
+            tool_config.name,
+            False,
+            latency,
+            result.exit_code,
+            f"Expected exit code {warmup.expected_exit_code}, got {result.exit_code}",
+        )
+    return ProbeResult(tool_config.name, True, latency, result.exit_code)
+
+
+async def probe_tools(
+    tools: list[ToolConfig], metrics: Metrics | None = None, concurrency: int = 8
+) -> list[ProbeResult]:
+    """Probe tools concurrently and record the outcome in ``metrics``."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(tool_config: ToolConfig) -> ProbeResult:
+        async with semaphore:
+            return await probe_tool(tool_config)
+
+    results = await asyncio.gather(*(bounded(tool) for tool in tools))
+
+    for result in results:
+        if metrics is not None:
+            metrics.set_gauge(f"healthy.{result.tool}", result.healthy)
+            if result.latency_sec is not None:
+                metrics.observe(f"warmup.{result.tool}", result.latency_sec)
+        if not result.healthy:
+            logger.warning(f"Tool {result.tool} is unhealthy: {result.error}")
+
+    return results
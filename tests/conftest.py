@@ -0,0 +1,23 @@
+"""Shared test fixtures."""
+
+import sys
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import ToolConfig
+
+
+@pytest.fixture
+def make_tool():
+    """Build a ToolConfig that runs Python; keyword arguments override fields."""
+
+    def factory(name, **fields):
+        defaults = {
+            "description": name,
+            "command": sys.executable,
+            "args": [],
+            "input_schema": {"type": "object"},
+        }
+        return ToolConfig(name=name, **{**defaults, **fields})
+
+    return factory
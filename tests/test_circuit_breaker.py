@@ -0,0 +1,167 @@
+"""Tests for the per-tool circuit breaker."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_stdio_toolbox.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from mcp_stdio_toolbox.config_loader import CircuitBreakerConfig, ToolConfig
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_breaker(clock, **kwargs):
+    config = CircuitBreakerConfig(min_calls=4, failure_ratio=0.5, open_sec=30, **kwargs)
+    return CircuitBreaker("codex_chat", config, clock=clock)
+
+
+def test_trips_open_after_failure_ratio(clock):
+    breaker = make_breaker(clock)
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED  # below min_calls
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.metrics.gauges["circuit_state.codex_chat"] == OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.to_dict()["error"] == "circuit_open"
+    assert exc_info.value.retry_after_sec == pytest.approx(30)
+    assert breaker.metrics.counters["circuit_rejected.codex_chat"] == 1
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker(clock, window_sec=10)
+
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 11
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 31
+    assert breaker.state == HALF_OPEN
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 31
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.metrics.counters["circuit_opened.codex_chat"] == 2
+
+
+def test_ignored_exit_codes_count_as_success(clock):
+    breaker = make_breaker(clock, ignore_exit_codes=[1])
+
+    for _ in range(4):
+        breaker.record_exit_code(1)
+
+    assert breaker.state == CLOSED
+
+
+@pytest.fixture
+def breaker_tool_config():
+    return ToolConfig(
+        name="curl_get",
+        description="Fetch a URL",
+        command="curl",
+        args=[],
+        input_schema={"type": "object"},
+        circuit_breaker=CircuitBreakerConfig(min_calls=2, failure_ratio=1.0),
+    )
+
+
+@pytest.mark.asyncio
+@patch("mcp_stdio_toolbox.tool_registry.run_command")
+async def test_registry_fails_fast_when_open(mock_run_command, breaker_tool_config):
+    mock_run_command.side_effect = TimeoutError("Command timed out after 30 seconds")
+
+    registry = ToolRegistry()
+    registry.register_tool(breaker_tool_config)
+    handler = registry.get_handler("curl_get")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="timed out"):
+            await handler({})
+
+    with pytest.raises(CircuitOpenError):
+        await handler({})
+
+    assert mock_run_command.call_count == 2
+    definition = registry.get_tool_definitions()[0]
+    assert definition["annotations"] == {"circuitState": OPEN}
+
+
+@pytest.mark.asyncio
+@patch("mcp_stdio_toolbox.tool_registry.run_command")
+async def test_registry_counts_nonzero_exit_as_failure(
+    mock_run_command, breaker_tool_config
+):
+    mock_result = AsyncMock()
+    mock_result.exit_code = 7
+    mock_result.stderr = "Failed to connect"
+    mock_run_command.return_value = mock_result
+
+    registry = ToolRegistry()
+    registry.register_tool(breaker_tool_config)
+    handler = registry.get_handler("curl_get")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="exit code 7"):
+            await handler({})
+
+    assert registry.breakers["curl_get"].state == OPEN
+
+
+def test_reregistering_without_breaker_drops_it(breaker_tool_config):
+    registry = ToolRegistry()
+    registry.register_tool(breaker_tool_config)
+
+    breaker_tool_config.circuit_breaker = None
+    registry.register_tool(breaker_tool_config)
+
+    assert "curl_get" not in registry.breakers
+    assert "annotations" not in registry.get_tool_definitions()[0]
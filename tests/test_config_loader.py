@@ -123,3 +123,550 @@ tools:
             load_config(config_path)
     finally:
         Path(config_path).unlink()
+
+
+def test_scheduling_and_tool_class():
+    config_yaml = """
+server:
+  scheduling:
+    max_concurrency: 4
+    reserved_interactive: 1
+    drop_unmeetable_deadlines: true
+    class_weights:
+      interactive: 8
+      bulk: 2
+
+tools:
+  - name: "codex_chat"
+    description: "Slow tool"
+    command: "codex"
+    class: "bulk"
+    priority: 3
+    input_schema:
+      type: object
+  - name: "echo"
+    description: "Fast tool"
+    command: "echo"
+    input_schema:
+      type: object
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        config = load_config(config_path)
+
+        scheduling = config.server.scheduling
+        assert scheduling.max_concurrency == 4
+        assert scheduling.reserved_interactive == 1
+        assert scheduling.drop_unmeetable_deadlines is True
+        assert scheduling.class_weights == {"interactive": 8, "bulk": 2}
+
+        assert config.tools[0].tool_class == "bulk"
+        assert config.tools[0].priority == 3
+        assert config.tools[1].tool_class == "interactive"
+        assert config.tools[1].priority == 0
+
+    finally:
+        Path(config_path).unlink()
+
+
+def test_invalid_scheduling():
+    config_yaml = """
+server:
+  scheduling:
+    max_concurrency: 2
+    reserved_interactive: 2
+
+tools: []
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        with pytest.raises(ValueError, match="reserved_interactive"):
+            load_config(config_path)
+    finally:
+        Path(config_path).unlink()
+
+
+def test_retry_and_hedge_policies():
+    config_yaml = """
+tools:
+  - name: "curl_get"
+    description: "Fetch a URL"
+    command: "curl"
+    idempotent: true
+    retry:
+      max_attempts: 4
+      retry_on_exit_codes: [6, 7, 28]
+    hedge: true
+    input_schema:
+      type: object
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        tool = load_config(config_path).tools[0]
+
+        assert tool.idempotent is True
+        assert tool.retry.max_attempts == 4
+        assert tool.retry.retry_on_exit_codes == [6, 7, 28]
+        assert tool.retry.retry_on_timeout is True
+        assert tool.hedge.percentile == 95
+
+    finally:
+        Path(config_path).unlink()
+
+
+def test_retry_requires_idempotent_tool():
+    config_yaml = """
+tools:
+  - name: "codex_chat"
+    description: "Not safe to repeat"
+    command: "codex"
+    retry:
+      max_attempts: 3
+    input_schema:
+      type: object
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        with pytest.raises(ValueError, match="must be marked idempotent"):
+            load_config(config_path)
+    finally:
+        Path(config_path).unlink()
+
+
+def test_circuit_breaker_defaults_and_overrides():
+    config_yaml = """
+server:
+  circuit_breaker:
+    min_calls: 10
+    open_sec: 15
+
+tools:
+  - name: "codex_chat"
+    description: "Uses server breaker"
+    command: "codex"
+    input_schema:
+      type: object
+  - name: "grep_file"
+    description: "Exit code 1 means no match"
+    command: "grep"
+    circuit_breaker:
+      ignore_exit_codes: [1]
+    input_schema:
+      type: object
+  - name: "echo"
+    description: "No breaker"
+    command: "echo"
+    circuit_breaker: false
+    input_schema:
+      type: object
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        codex, grep, echo = load_config(config_path).tools
+
+        assert codex.circuit_breaker.min_calls == 10
+        assert codex.circuit_breaker.open_sec == 15
+        assert grep.circuit_breaker.min_calls == 5
+        assert grep.circuit_breaker.ignore_exit_codes == [1]
+        assert echo.circuit_breaker is None
+
+    finally:
+        Path(config_path).unlink()
+
+
+def test_warmup_block():
+    config_yaml = """
+tools:
+  - name: "codex_chat"
+    description: "Slow to start"
+    command: "codex"
+    warmup:
+      args: ["--version"]
+      timeout_sec: 10
+    input_schema:
+      type: object
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        tool = load_config(config_path).tools[0]
+
+        assert tool.warmup.args == ["--version"]
+        assert tool.warmup.expected_exit_code == 0
+        assert tool.warmup.timeout_sec == 10
+
+    finally:
+        Path(config_path).unlink()
+
+
+def write_tool_file(path, *names):
+    tools = "".join(
+        f"""
+  - name: "{name}"
+    description: "{name} tool"
+    command: "echo"
+    input_schema:
+      type: object
+"""
+        for name in names
+    )
+    path.write_text(f"tools:{tools}")
+
+
+def test_include_globs(tmp_path):
+    (tmp_path / "teams").mkdir()
+    write_tool_file(tmp_path / "teams" / "b.yaml", "beta")
+    write_tool_file(tmp_path / "teams" / "a.yaml", "alpha", "alpha2")
+    write_tool_file(tmp_path / "extra.yaml", "extra")
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text(
+        """
+server:
+  default_timeout_sec: 45
+include:
+  - "teams/*.yaml"
+  - "extra.yaml"
+tools:
+  - name: "main"
+    description: "Main file tool"
+    command: "echo"
+    input_schema:
+      type: object
+"""
+    )
+
+    config = load_config(config_path)
+
+    names = [tool.name for tool in config.tools]
+    assert names == ["main", "alpha", "alpha2", "beta", "extra"]
+    # Server defaults apply to included tools too
+    assert all(tool.timeout_sec == 45 for tool in config.tools)
+
+
+def test_absolute_include_glob(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    write_tool_file(shared / "git.yaml", "git_status")
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    config_path = config_dir / "tools.yaml"
+    config_path.write_text(f'include: ["{shared}/*.yaml"]\n')
+
+    config = load_config(config_path)
+
+    assert [tool.name for tool in config.tools] == ["git_status"]
+
+
+def test_tools_d_directory(tmp_path):
+    (tmp_path / "tools.d").mkdir()
+    write_tool_file(tmp_path / "tools.d" / "20-git.yaml", "git_status")
+    write_tool_file(tmp_path / "tools.d" / "10-curl.yml", "curl_get")
+    (tmp_path / "tools.d" / "README.md").write_text("not a tool file")
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("server:\n  name: split\n")
+
+    config = load_config(config_path)
+
+    assert config.server.name == "split"
+    assert [tool.name for tool in config.tools] == ["curl_get", "git_status"]
+
+
+def test_missing_literal_include(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text('include: ["missing.yaml"]\ntools: []\n')
+
+    with pytest.raises(FileNotFoundError, match="Included file not found"):
+        load_config(config_path)
+
+
+def test_duplicate_tool_names(tmp_path):
+    write_tool_file(tmp_path / "more.yaml", "echo")
+    config_path = tmp_path / "tools.yaml"
+    write_tool_file(config_path, "echo")
+    config_path.write_text('include: ["more.yaml"]\n' + config_path.read_text())
+
+    with pytest.raises(ValueError, match="Duplicate tool name: echo"):
+        load_config(config_path)
+
+
+def test_stdin_from():
+    config_yaml = """
+tools:
+  - name: "codex_chat"
+    description: "Prompt on stdin"
+    command: "codex"
+    stdin_from: "prompt"
+    input_schema:
+      type: object
+      properties:
+        prompt:
+          type: string
+"""
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
+        f.write(config_yaml)
+        config_path = f.name
+
+    try:
+        assert load_config(config_path).tools[0].stdin_from == "prompt"
+    finally:
+        Path(config_path).unlink()
+
+
+@pytest.mark.parametrize("stdin_from", ["promt", ""])
+def test_stdin_from_must_name_a_property(tmp_path, stdin_from):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text(f"""
+tools:
+  - name: "codex_chat"
+    description: "Prompt on stdin"
+    command: "codex"
+    stdin_from: "{stdin_from}"
+    input_schema:
+      type: object
+      properties:
+        prompt:
+          type: string
+""")
+
+    with pytest.raises(ValueError, match="stdin_from must be '\\*' or an input"):
+        load_config(config_path)
+
+
+def test_stdin_from_all_arguments(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+tools:
+  - name: "jq"
+    description: "Arguments as JSON on stdin"
+    command: "jq"
+    stdin_from: "*"
+    input_schema:
+      type: object
+""")
+
+    assert load_config(config_path).tools[0].stdin_from == "*"
+
+
+@pytest.mark.parametrize(
+    "tool_type, target",
+    [
+        ("http", 'http: {url: "https://example.com"}'),
+        ("python", 'function: "os:getcwd"'),
+    ],
+)
+def test_stdin_from_rejected_for_other_tool_types(tmp_path, tool_type, target):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text(f"""
+tools:
+  - name: "fetch"
+    description: "Not a subprocess"
+    type: "{tool_type}"
+    {target}
+    stdin_from: "body"
+    input_schema:
+      type: object
+      properties:
+        body:
+          type: string
+""")
+
+    with pytest.raises(ValueError, match="only applies to subprocess tools"):
+        load_config(config_path)
+
+
+def test_http_tool(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+server:
+  http:
+    max_connections_per_host: 4
+tools:
+  - name: "openai_chat"
+    description: "Chat over HTTP"
+    type: "http"
+    http:
+      method: "post"
+      url: "https://api.openai.com/v1/chat/completions"
+      headers:
+        Authorization: "Bearer ${OPENAI_API_KEY}"
+      body:
+        messages: [{role: "user", content: "{message}"}]
+      extract: "choices.0.message.content"
+    input_schema:
+      type: object
+""")
+
+    config = load_config(config_path)
+
+    tool = config.tools[0]
+    assert tool.tool_type == "http"
+    assert tool.command == ""
+    assert tool.http.method == "POST"
+    assert tool.http.extract == "choices.0.message.content"
+    assert config.server.http.max_connections_per_host == 4
+    assert config.server.http.max_connections == 100
+
+
+def test_http_tool_requires_http_block(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+tools:
+  - name: "api"
+    description: "No request"
+    type: "http"
+    input_schema:
+      type: object
+""")
+
+    with pytest.raises(ValueError, match="Tool missing required fields"):
+        load_config(config_path)
+
+
+def test_unknown_tool_type(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+tools:
+  - name: "api"
+    description: "Unknown"
+    type: "grpc"
+    input_schema:
+      type: object
+""")
+
+    with pytest.raises(ValueError, match="unknown type 'grpc'"):
+        load_config(config_path)
+
+
+def test_python_tool(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+tools:
+  - name: "hash_file"
+    description: "Hash a file in-process"
+    type: "python"
+    function: "hashlib_tools:sha256_file"
+    cpu_bound: true
+    input_schema:
+      type: object
+""")
+
+    tool = load_config(config_path).tools[0]
+
+    assert tool.tool_type == "python"
+    assert tool.function == "hashlib_tools:sha256_file"
+    assert tool.cpu_bound
+
+
+def test_python_tool_function_reference(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+tools:
+  - name: "hash_file"
+    description: "Bad reference"
+    type: "python"
+    function: "hashlib_tools.sha256_file"
+    input_schema:
+      type: object
+""")
+
+    with pytest.raises(ValueError, match="function must look like 'module:function'"):
+        load_config(config_path)
+
+
+def test_tracing(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+server:
+  tracing:
+    enabled: true
+    exporter: "jsonl"
+    path: "/tmp/traces.jsonl"
+tools: []
+""")
+
+    tracing = load_config(config_path).server.tracing
+
+    assert tracing.enabled
+    assert tracing.exporter == "jsonl"
+    assert tracing.path == "/tmp/traces.jsonl"
+    assert tracing.service_name == "mcp-stdio-toolbox"
+
+
+def test_invalid_tracing_exporter(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+server:
+  tracing:
+    exporter: "zipkin"
+tools: []
+""")
+
+    with pytest.raises(ValueError, match="tracing.exporter must be"):
+        load_config(config_path)
+
+
+def test_recording(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+server:
+  recording:
+    enabled: true
+    redact: ["prompt"]
+tools: []
+""")
+
+    recording = load_config(config_path).server.recording
+
+    assert recording.enabled
+    assert recording.path == "toolbox-calls.jsonl"
+    assert recording.redact == ["prompt"]
+
+
+def test_empty_server_blocks_use_defaults(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+server:
+  scheduling:
+    # max_concurrency: 4
+  http:
+  tracing:
+  recording:
+tools: []
+""")
+
+    server = load_config(config_path).server
+
+    assert server.scheduling.max_concurrency is None
+    assert not server.tracing.enabled
+    assert not server.recording.enabled
+
+
+def test_empty_server_section(tmp_path):
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("server:\ntools: []\n")
+
+    assert load_config(config_path).server.name == "mcp-stdio-toolbox"
@@ -0,0 +1,273 @@
+"""Tests for http tools against a local stub server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import (
+    HttpClientConfig,
+    HttpRequestConfig,
+    ToolConfig,
+)
+from mcp_stdio_toolbox.http_tool import (
+    HttpClientPool,
+    extract_field,
+    render_template,
+    render_url,
+    run_http_request,
+)
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        with server.lock:
+            server.client_ports.add(self.client_address[1])
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if parts.path == "/slow":
+                time.sleep(0.2)
+                self._reply(200, b"slow")
+            elif parts.path == "/big":
+                self._reply(200, b"x" * 10_000)
+            elif parts.path == "/status":
+                code = int(parse_qs(parts.query)["code"][0])
+                self._reply(code, b"upstream unavailable")
+            else:
+                echo = {
+                    "method": self.command,
+                    "path": parts.path,
+                    "query": parse_qs(parts.query),
+                    "headers": {k.lower(): v for k, v in self.headers.items()},
+                    "json": json.loads(body) if body else None,
+                }
+                self._reply(200, json.dumps(echo).encode())
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _reply(self, code, payload):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.client_ports = set()
+    server.active = 0
+    server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+async def pool():
+    pool = HttpClientPool()
+    yield pool
+    await pool.aclose()
+
+
+def test_render_template_keeps_types_and_drops_missing(monkeypatch):
+    monkeypatch.setenv("API_TOKEN", "secret{x}")
+    template = {
+        "auth": "Bearer ${API_TOKEN}",
+        "limit": "{limit}",
+        "text": "say {word}",
+        "optional": "{absent}",
+        "items": ["{word}", "{absent}"],
+    }
+
+    rendered = render_template(template, {"limit": 5, "word": "hi"})
+
+    assert rendered == {
+        "auth": "Bearer secret{x}",
+        "limit": 5,
+        "text": "say hi",
+        "items": ["hi"],
+    }
+
+
+def test_render_template_missing_field_in_string():
+    with pytest.raises(ValueError, match="Missing value for template field: word"):
+        render_template("say {word}", {})
+
+
+def test_render_url_encodes_values():
+    assert (
+        render_url("https://api.example.com/users/{name}", {"name": "a b/c"})
+        == "https://api.example.com/users/a%20b%2Fc"
+    )
+    assert render_url("{url}", {"url": "http://x/?q=1"}) == "http://x/?q=1"
+
+
+def test_extract_field():
+    data = {"choices": [{"message": {"content": "hello"}}]}
+    assert extract_field(data, "choices.0.message.content") == "hello"
+
+
+@pytest.mark.asyncio
+async def test_get_with_url_and_query_templates(stub_server, pool):
+    request = HttpRequestConfig(
+        url=stub_server.base_url + "/items/{item}",
+        headers={"X-Trace": "{trace}"},
+        query={"page": "{page}", "filter": "{absent}"},
+    )
+
+    result = await run_http_request(
+        pool, request, {"item": "a b", "page": 2, "trace": 7}
+    )
+
+    assert result.exit_code == 0
+    echo = json.loads(result.stdout)
+    assert echo["method"] == "GET"
+    assert echo["path"] == "/items/a%20b"
+    assert echo["query"] == {"page": ["2"]}
+    assert echo["headers"]["x-trace"] == "7"
+
+
+@pytest.mark.asyncio
+async def test_post_json_body_with_extract(stub_server, pool):
+    request = HttpRequestConfig(
+        url=stub_server.base_url + "/chat",
+        method="POST",
+        body={"messages": [{"role": "user", "content": "{message}"}], "n": "{n}"},
+        extract="json.messages.0.content",
+    )
+
+    result = await run_http_request(pool, request, {"message": "hi", "n": 3})
+
+    assert result.exit_code == 0
+    assert result.stdout == "hi"
+
+
+@pytest.mark.asyncio
+async def test_non_success_status_becomes_exit_code(stub_server, pool):
+    request = HttpRequestConfig(url=stub_server.base_url + "/status?code=503")
+
+    result = await run_http_request(pool, request, {})
+
+    assert result.exit_code == 503
+    assert result.stderr == "upstream unavailable"
+    assert result.stdout == ""
+
+
+@pytest.mark.asyncio
+async def test_output_is_truncated(stub_server, pool):
+    request = HttpRequestConfig(url=stub_server.base_url + "/big")
+
+    result = await run_http_request(pool, request, {}, max_output_bytes=100)
+
+    assert result.truncated
+    assert result.stdout == "x" * 100 + "\n[OUTPUT TRUNCATED]"
+
+
+@pytest.mark.asyncio
+async def test_timeout(stub_server, pool):
+    request = HttpRequestConfig(url=stub_server.base_url + "/slow")
+
+    with pytest.raises(TimeoutError, match="timed out"):
+        await run_http_request(pool, request, {}, timeout_sec=0.05)
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(stub_server, pool):
+    request = HttpRequestConfig(url=stub_server.base_url + "/echo")
+
+    for _ in range(5):
+        result = await run_http_request(pool, request, {})
+        assert result.exit_code == 0
+
+    assert len(stub_server.client_ports) == 1
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit(stub_server):
+    pool = HttpClientPool(HttpClientConfig(max_connections_per_host=2))
+    request = HttpRequestConfig(url=stub_server.base_url + "/slow")
+
+    try:
+        results = await asyncio.gather(
+            *(run_http_request(pool, request, {}) for _ in range(6))
+        )
+    finally:
+        await pool.aclose()
+
+    assert all(result.exit_code == 0 for result in results)
+    assert stub_server.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_registry_runs_http_tool(stub_server):
+    registry = ToolRegistry()
+    registry.register_tool(
+        ToolConfig(
+            name="lookup",
+            description="Lookup",
+            command="",
+            args=[],
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "q": {"type": "string"},
+                    "lang": {"type": "string", "default": "en"},
+                },
+                "required": ["q"],
+            },
+            tool_type="http",
+            http=HttpRequestConfig(
+                url=stub_server.base_url + "/search",
+                query={"q": "{q}", "lang": "{lang}"},
+            ),
+        )
+    )
+    registry.register_tool(
+        ToolConfig(
+            name="broken",
+            description="Broken",
+            command="",
+            args=[],
+            input_schema={"type": "object"},
+            tool_type="http",
+            http=HttpRequestConfig(url=stub_server.base_url + "/status?code=502"),
+        )
+    )
+
+    try:
+        result = await registry.get_handler("lookup")({"q": "cats"})
+        with pytest.raises(RuntimeError, match=r"HTTP request failed \(status 502\)"):
+            await registry.get_handler("broken")({})
+    finally:
+        await registry.aclose()
+
+    assert json.loads(result[0]["text"])["query"] == {"q": ["cats"], "lang": ["en"]}
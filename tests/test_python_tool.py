@@ -0,0 +1,169 @@
+"""Tests for in-process Python function tools."""
+
+import asyncio
+import functools
+import os
+import time
+
+import pytest
+
+from mcp_stdio_toolbox.python_tool import WorkerPool, load_function, run_function
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+from mcp_stdio_toolbox.warmup import probe_tool
+
+
+def word_count(text, unique=False):
+    words = text.split()
+    return {"words": len(set(words) if unique else words)}
+
+
+async def shout(text):
+    await asyncio.sleep(0)
+    return text.upper()
+
+
+def worker_pid():
+    return os.getpid()
+
+
+def fail(reason):
+    raise ValueError(reason)
+
+
+def slow():
+    time.sleep(0.5)
+
+
+@pytest.fixture
+def python_tool(make_tool):
+    schema = {
+        "type": "object",
+        "properties": {
+            "text": {"type": "string"},
+            "unique": {"type": "boolean", "default": True},
+        },
+    }
+    return functools.partial(
+        make_tool, tool_type="python", command="", input_schema=schema
+    )
+
+
+def test_load_function():
+    assert load_function("os.path:join") is os.path.join
+    assert load_function("tests.test_python_tool:word_count") is word_count
+
+
+def test_load_function_invalid_reference():
+    with pytest.raises(ValueError, match="Expected 'module:function'"):
+        load_function("os.path.join")
+    with pytest.raises(AttributeError):
+        load_function("os.path:missing")
+
+
+@pytest.mark.asyncio
+async def test_sync_function_runs_in_thread():
+    result = await run_function(word_count, {"text": "a b a"})
+
+    assert result.exit_code == 0
+    assert result.stdout == '{"words": 3}'
+
+
+@pytest.mark.asyncio
+async def test_async_function():
+    result = await run_function(shout, {"text": "hi"})
+
+    assert result.stdout == "HI"
+
+
+@pytest.mark.asyncio
+async def test_exception_exits_with_code_1():
+    result = await run_function(fail, {"reason": "bad input"})
+
+    assert result.exit_code == 1
+    assert result.stderr == "ValueError: bad input"
+
+
+@pytest.mark.asyncio
+async def test_timeout():
+    with pytest.raises(TimeoutError, match="Function timed out after 0.05 seconds"):
+        await run_function(slow, {}, timeout_sec=0.05)
+
+
+@pytest.mark.asyncio
+async def test_output_is_truncated():
+    result = await run_function(shout, {"text": "x" * 50}, max_output_bytes=10)
+
+    assert result.truncated
+    assert result.stdout == "X" * 10 + "\n[OUTPUT TRUNCATED]"
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_function_runs_in_worker_process():
+    pool = WorkerPool(max_workers=1)
+    try:
+        result = await run_function(worker_pid, {}, pool=pool)
+    finally:
+        pool.shutdown()
+
+    assert result.exit_code == 0
+    assert int(result.stdout) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_registry_runs_python_tool(python_tool):
+    registry = ToolRegistry()
+    registry.register_tool(
+        python_tool("count", function="tests.test_python_tool:word_count")
+    )
+    registry.register_tool(python_tool("fail", function="tests.test_python_tool:fail"))
+
+    result = await registry.get_handler("count")({"text": "a b a"})
+
+    assert result == [{"type": "text", "text": '{"words": 2}'}]
+    assert registry.metrics.latency("tool.count").count == 1
+    with pytest.raises(RuntimeError, match="Function failed: TypeError"):
+        await registry.get_handler("fail")({"text": "x"})
+
+
+@pytest.mark.asyncio
+async def test_warmup_checks_import(python_tool):
+    healthy = await probe_tool(
+        python_tool("count", function="tests.test_python_tool:word_count")
+    )
+    missing = await probe_tool(
+        python_tool("gone", function="tests.no_such_module:func")
+    )
+
+    assert healthy.healthy
+    assert not missing.healthy
+    assert "Can't import" in missing.error
+
+
+@pytest.mark.asyncio
+async def test_first_call_imports_off_the_event_loop(
+    python_tool, tmp_path, monkeypatch
+):
+    (tmp_path / "slow_first_call.py").write_text(
+        "import time\ntime.sleep(0.5)\n\ndef run(text, unique):\n    return text\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    registry = ToolRegistry()
+    registry.register_tool(python_tool("slow", function="slow_first_call:run"))
+    registry.register_tool(python_tool("gone", function="tests.no_such_module:func"))
+    handler = registry.get_handler("slow")
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.05)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    result = await handler({"text": "hi"})
+    ticker.cancel()
+
+    assert result[0]["text"] == "hi"
+    assert ticks >= 5
+    with pytest.raises(RuntimeError, match="Can't import tests.no_such_module:func"):
+        await registry.get_handler("gone")({"text": "x"})
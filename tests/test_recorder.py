@@ -0,0 +1,64 @@
+"""Tests for call recording."""
+
+import json
+
+from mcp_stdio_toolbox.config_loader import RecordingConfig
+from mcp_stdio_toolbox.recorder import REDACTED, CallRecorder, read_records, redact
+
+
+def test_redact_matches_keys_at_any_depth():
+    arguments = {
+        "prompt": "hi",
+        "API_KEY": "sk-1",
+        "headers": [{"Authorization": "Bearer x", "accept": "json"}],
+        "auth": {"refresh_token": "t", "user": "me"},
+    }
+
+    redacted = redact(arguments, RecordingConfig().redact)
+
+    assert redacted == {
+        "prompt": "hi",
+        "API_KEY": REDACTED,
+        "headers": [{"Authorization": REDACTED, "accept": "json"}],
+        "auth": {"refresh_token": REDACTED, "user": "me"},
+    }
+    assert arguments["API_KEY"] == "sk-1"
+
+
+def test_recorder_appends_compact_lines(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    recorder = CallRecorder(RecordingConfig(enabled=True, path=str(path)))
+
+    recorder.record("echo", {"text": "hi", "password": "x"}, 100.5, 0.0123, 3, 0.01)
+    recorder.record("grep", {}, 100.25, 0.5, 0, error="invalid")
+    recorder.close()
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == (
+        '{"t":100.5,"tool":"echo","args":{"text":"hi","password":"[REDACTED]"},'
+        '"ms":12.3,"bytes":3,"ok":true,"service_ms":10.0}'
+    )
+    assert json.loads(lines[1])["ok"] is False
+
+    records = read_records(path)
+    assert [record.tool for record in records] == ["grep", "echo"]
+    assert records[0].error == "invalid"
+    assert (records[1].ms, records[1].service_ms, records[1].error) == (12.3, 10, None)
+
+
+def test_read_records_without_service_time(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    path.write_text('{"t":1,"tool":"echo","args":{},"ms":5,"bytes":0,"ok":false}\n')
+
+    (record,) = read_records(path)
+
+    assert record.service_ms is None
+    assert record.error is None
+
+
+def test_recorder_write_errors_are_ignored(tmp_path):
+    recorder = CallRecorder(
+        RecordingConfig(enabled=True, path=str(tmp_path / "missing" / "calls.jsonl"))
+    )
+
+    recorder.record("echo", {}, 0.0, 0.0, 0)
@@ -0,0 +1,187 @@
+"""Tests for replaying recorded calls."""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import Config, ServerConfig, ToolConfig
+from mcp_stdio_toolbox.recorder import CallRecord
+from mcp_stdio_toolbox.replay import (
+    STUB_FUNCTION,
+    replay,
+    replay_log,
+    stub_tool,
+    stub_tools,
+    summarize,
+)
+
+
+class FakeSession:
+    """Answers calls after the stub's recorded latency, tracking concurrency."""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            text = await stub_tool(**arguments) if "ms" in arguments else "real"
+        except RuntimeError as e:
+            text = f"Error: {e}"
+        finally:
+            self.active -= 1
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], isError=False)
+
+
+def make_records(count, interval=0.0, ms=20.0):
+    return [
+        CallRecord(
+            t=1000 + i * interval,
+            tool="echo",
+            args={"text": str(i)},
+            ms=ms,
+            bytes=5,
+            ok=i != 0,
+        )
+        for i in range(count)
+    ]
+
+
+def test_stub_tools_keep_policies():
+    tool = ToolConfig(
+        name="codex",
+        description="Codex",
+        command="codex",
+        args=["exec"],
+        input_schema={"type": "object", "required": ["prompt"]},
+        tool_class="bulk",
+        priority=3,
+        stdin_from="prompt",
+    )
+
+    (stub,) = stub_tools(Config(server=ServerConfig(), tools=[tool])).tools
+
+    assert stub.tool_type == "python"
+    assert stub.function == STUB_FUNCTION
+    assert stub.stdin_from is None
+    assert (stub.name, stub.tool_class, stub.priority) == ("codex", "bulk", 3)
+    assert tool.tool_type == "subprocess"
+
+
+@pytest.mark.asyncio
+async def test_stub_tool_mimics_latency_and_size():
+    assert await stub_tool(ms=1, bytes=4) == "xxxx"
+    with pytest.raises(RuntimeError, match="Recorded call failed"):
+        await stub_tool(ok=False)
+
+
+@pytest.mark.asyncio
+async def test_replay_keeps_scaled_arrival_times():
+    session = FakeSession()
+    records = make_records(3, interval=0.2, ms=1)
+
+    calls, duration = await replay(session, records, speed=2)
+
+    assert 0.2 <= duration < 0.35
+    assert session.calls[1] == ("echo", {"ms": 1, "bytes": 5, "ok": True})
+    assert [call.ok for call in calls] == [False, True, True]
+
+
+@pytest.mark.asyncio
+async def test_replay_max_speed_limits_concurrency():
+    session = FakeSession()
+
+    calls, duration = await replay(session, make_records(8), speed=None, concurrency=2)
+
+    assert len(calls) == 8
+    assert session.peak == 2
+    assert duration < 0.2
+
+
+@pytest.mark.asyncio
+async def test_replay_real_arguments():
+    session = FakeSession()
+
+    await replay(session, make_records(1), speed=None, stub=False)
+
+    assert session.calls == [("echo", {"text": "0"})]
+
+
+@pytest.mark.asyncio
+async def test_stubs_take_service_time_and_skip_rejections():
+    session = FakeSession()
+    records = make_records(4, ms=500)
+    records[0].error = "circuit_open"
+    records[1].error, records[1].ok = "invalid", False
+    records[2].service_ms = 2
+    records[3].error, records[3].ok, records[3].service_ms = "dropped", False, 0
+
+    calls, _ = await replay(session, records, speed=None)
+
+    assert session.calls == [
+        ("echo", {"ms": 2, "bytes": 5, "ok": True}),
+        ("echo", {"ms": 0, "bytes": 5, "ok": True}),
+    ]
+    assert [call.rejected for call in calls] == [True, True, False, False]
+
+    summary = summarize(calls, 1.0, records)
+    assert summary["rejected"] == summary["recorded_rejected"] == 2
+    assert summary["errors"] == 0
+    assert summary["recorded_errors"] == 1
+    assert summary["latency"]["count"] == summary["recorded_latency"]["count"] == 2
+
+
+def test_summarize():
+    records = make_records(4, ms=10)
+    calls = [
+        SimpleNamespace(
+            tool="echo", latency_sec=0.01 * (i + 1), ok=i != 0, rejected=False
+        )
+        for i in range(4)
+    ]
+
+    summary = summarize(calls, 2.0, records)
+
+    assert summary["calls"] == 4
+    assert summary["errors"] == 1
+    assert summary["recorded_errors"] == 1
+    assert summary["throughput_per_sec"] == 2.0
+    assert summary["latency"]["p50"] == pytest.approx(0.02)
+    assert summary["recorded_latency"]["max"] == pytest.approx(0.01)
+    assert summary["tools"]["echo"]["count"] == 4
+    assert summary["rejected"] == summary["recorded_rejected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_log_against_stub_server(tmp_path, monkeypatch):
+    src = Path(__file__).resolve().parents[1] / "src"
+    pythonpath = [str(src), os.environ.get("PYTHONPATH", "")]
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(pythonpath))
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text("""
+server:
+  scheduling:
+    max_concurrency: 1
+tools:
+  - name: "echo"
+    description: "Echo"
+    command: "echo"
+    input_schema:
+      type: object
+""")
+
+    summary = await replay_log(
+        str(config_path), make_records(4, ms=50), speed=None, concurrency=4
+    )
+
+    assert summary["calls"] == 4
+    assert summary["errors"] == 1
+    # One slot: the four 50 ms calls run one after another.
+    assert summary["duration_sec"] >= 0.2
+    assert summary["latency"]["max"] >= 0.2
@@ -0,0 +1,230 @@
+"""Tests for retry and hedging policies."""
+
+import asyncio
+import functools
+import sys
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import (
+    HedgePolicy,
+    RetryPolicy,
+    SchedulingConfig,
+    ServerConfig,
+)
+from mcp_stdio_toolbox.metrics import Metrics
+from mcp_stdio_toolbox.retry import backoff_delay, run_with_retries
+from mcp_stdio_toolbox.subprocess_runner import SubprocessResult, run_command
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+
+# Fails with exit code 75 until it has been called FAIL_TIMES times, and sleeps
+# SLOW_SEC on its first call. The call count lives in a state file.
+FLAKY_SCRIPT = """
+import sys, time
+from pathlib import Path
+
+state, fail_times, slow_sec = Path(sys.argv[1]), int(sys.argv[2]), float(sys.argv[3])
+calls = int(state.read_text()) if state.exists() else 0
+state.write_text(str(calls + 1))
+if calls == 0 and slow_sec:
+    time.sleep(slow_sec)
+if calls < fail_times:
+    sys.exit(75)
+print(f"ok after {calls + 1} calls")
+"""
+
+
+@pytest.fixture
+def flaky(tmp_path):
+    script = tmp_path / "flaky.py"
+    script.write_text(FLAKY_SCRIPT)
+    state = tmp_path / "calls"
+
+    def make_attempt(fail_times=0, slow_sec=0.0, timeout_sec=5):
+        args = [str(script), str(state), str(fail_times), str(slow_sec)]
+        return lambda: run_command(sys.executable, args, timeout_sec)
+
+    make_attempt.calls = lambda: int(state.read_text())
+    return make_attempt
+
+
+@pytest.fixture
+def curl_tool(make_tool):
+    return functools.partial(make_tool, "curl_get", idempotent=True)
+
+
+def fast_retry(**kwargs):
+    return RetryPolicy(backoff_base_sec=0.01, backoff_max_sec=0.05, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_retries_on_retryable_exit_code(flaky, curl_tool):
+    tool = curl_tool(retry=fast_retry(max_attempts=3, retry_on_exit_codes=[75]))
+    metrics = Metrics()
+
+    result = await run_with_retries(tool, flaky(fail_times=2), metrics)
+
+    assert result.exit_code == 0
+    assert "ok after 3 calls" in result.stdout
+    assert metrics.counters["retries.curl_get"] == 2
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts(flaky, curl_tool):
+    tool = curl_tool(retry=fast_retry(max_attempts=2, retry_on_exit_codes=[75]))
+
+    result = await run_with_retries(tool, flaky(fail_times=5), Metrics())
+
+    assert result.exit_code == 75
+    assert flaky.calls() == 2
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_exit_code_returns_immediately(flaky, curl_tool):
+    tool = curl_tool(retry=fast_retry(max_attempts=3, retry_on_exit_codes=[1]))
+
+    result = await run_with_retries(tool, flaky(fail_times=5), Metrics())
+
+    assert result.exit_code == 75
+    assert flaky.calls() == 1
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_tool_is_never_retried(flaky, curl_tool):
+    tool = curl_tool(
+        idempotent=False, retry=fast_retry(max_attempts=3, retry_on_exit_codes=[75])
+    )
+
+    result = await run_with_retries(tool, flaky(fail_times=1), Metrics())
+
+    assert result.exit_code == 75
+    assert flaky.calls() == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_after_timeout(flaky, curl_tool):
+    tool = curl_tool(retry=fast_retry(max_attempts=2))
+
+    result = await run_with_retries(tool, flaky(slow_sec=10, timeout_sec=1), Metrics())
+
+    assert result.exit_code == 0
+    assert flaky.calls() == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_not_retried_when_disabled(flaky, curl_tool):
+    tool = curl_tool(retry=fast_retry(max_attempts=2, retry_on_timeout=False))
+
+    with pytest.raises(TimeoutError):
+        await run_with_retries(tool, flaky(slow_sec=10, timeout_sec=1), Metrics())
+
+    assert flaky.calls() == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_launches_second_attempt_past_p95(flaky, curl_tool):
+    tool = curl_tool(hedge=HedgePolicy(percentile=95, min_samples=5))
+    metrics = Metrics()
+    for _ in range(5):
+        metrics.observe("attempt.curl_get", 0.2)
+
+    result = await run_with_retries(tool, flaky(slow_sec=10), metrics)
+
+    assert result.exit_code == 0
+    assert "ok after 2 calls" in result.stdout
+    assert metrics.counters["hedges.curl_get"] == 1
+    assert metrics.counters["hedge_wins.curl_get"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_waits_for_enough_samples(flaky, curl_tool):
+    tool = curl_tool(hedge=HedgePolicy(percentile=95, min_samples=5))
+    metrics = Metrics()
+
+    result = await run_with_retries(tool, flaky(slow_sec=0.3), metrics)
+
+    assert result.exit_code == 0
+    assert flaky.calls() == 1
+    assert "hedges.curl_get" not in metrics.counters
+    assert metrics.latency("attempt.curl_get").count == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_faster_than_hedge_delay(flaky, curl_tool):
+    tool = curl_tool(hedge=HedgePolicy(percentile=95, min_samples=5))
+    metrics = Metrics()
+    for _ in range(5):
+        metrics.observe("attempt.curl_get", 5.0)
+
+    result = await run_with_retries(tool, flaky(), metrics)
+
+    assert result.exit_code == 0
+    assert flaky.calls() == 1
+    assert "hedges.curl_get" not in metrics.counters
+
+
+def limited_registry(max_concurrency=1):
+    registry = ToolRegistry()
+    registry.configure(
+        ServerConfig(scheduling=SchedulingConfig(max_concurrency=max_concurrency))
+    )
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_backoff_releases_dispatcher_slot(curl_tool):
+    tool = curl_tool(
+        retry=RetryPolicy(
+            max_attempts=2, backoff_base_sec=0.3, jitter=False, retry_on_exit_codes=[75]
+        )
+    )
+    registry = limited_registry()
+    exit_codes = iter([75, 0])
+
+    async def attempt():
+        return SubprocessResult("", "", next(exit_codes))
+
+    call = asyncio.create_task(registry._execute(tool, attempt, None))
+    await asyncio.sleep(0.1)
+    assert registry.dispatcher.running == 0
+
+    result = await call
+    assert result.exit_code == 0
+    assert registry.metrics.counters["retries.curl_get"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_counts_against_concurrency_limit(curl_tool):
+    tool = curl_tool(hedge=HedgePolicy(percentile=95, min_samples=5))
+    registry = limited_registry()
+    for _ in range(5):
+        registry.metrics.observe("attempt.curl_get", 0.05)
+    in_flight, peak = [], []
+
+    async def attempt():
+        in_flight.append(None)
+        peak.append(len(in_flight))
+        try:
+            await asyncio.sleep(0.3)
+        finally:
+            in_flight.pop()
+        return SubprocessResult("done", "", 0)
+
+    result = await registry._execute(tool, attempt, None)
+
+    assert result.stdout == "done"
+    assert registry.metrics.counters["hedges.curl_get"] == 1
+    # The hedge queued for a slot instead of running beside the primary.
+    assert max(peak) == 1
+    assert registry.dispatcher.running == 0
+
+
+def test_backoff_delay_is_capped():
+    policy = RetryPolicy(backoff_base_sec=1, backoff_max_sec=5, jitter=False)
+
+    assert backoff_delay(policy, 1) == 1
+    assert backoff_delay(policy, 2) == 2
+    assert backoff_delay(policy, 10) == 5
+
+    jittered = RetryPolicy(backoff_base_sec=1, backoff_max_sec=5)
+    assert all(0 <= backoff_delay(jittered, 3) <= 4 for _ in range(20))
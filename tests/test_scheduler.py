@@ -0,0 +1,260 @@
+"""Tests for the weighted-fair dispatcher."""
+
+import asyncio
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import SchedulingConfig
+from mcp_stdio_toolbox.scheduler import Dispatcher, QueueDeadlineError, timed_call
+
+
+async def blocked_call(gate, started, label):
+    started.append(label)
+    await gate.wait()
+    return label
+
+
+@pytest.mark.asyncio
+async def test_unlimited_runs_immediately(make_tool):
+    dispatcher = Dispatcher(SchedulingConfig())
+
+    result = await dispatcher.run(make_tool("echo"), lambda: asyncio.sleep(0, "ok"))
+
+    assert result == "ok"
+    assert dispatcher.running == 0
+    assert dispatcher.metrics.latency("class.interactive").count == 1
+    assert dispatcher.metrics.latency("tool.echo").count == 1
+
+
+@pytest.mark.asyncio
+async def test_reserved_slot_keeps_interactive_responsive(make_tool):
+    dispatcher = Dispatcher(SchedulingConfig(max_concurrency=2, reserved_interactive=1))
+    gate = asyncio.Event()
+    started = []
+    bulk = make_tool("codex_chat", tool_class="bulk")
+
+    bulk_tasks = [
+        asyncio.create_task(
+            dispatcher.run(bulk, lambda i=i: blocked_call(gate, started, f"bulk{i}"))
+        )
+        for i in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    assert started == ["bulk0"]
+
+    result = await asyncio.wait_for(
+        dispatcher.run(make_tool("git_status"), lambda: asyncio.sleep(0, "fast")),
+        timeout=1,
+    )
+    assert result == "fast"
+
+    gate.set()
+    await asyncio.gather(*bulk_tasks)
+    assert started == ["bulk0", "bulk1", "bulk2"]
+
+
+@pytest.mark.asyncio
+async def test_weighted_fair_share_between_classes(make_tool):
+    dispatcher = Dispatcher(
+        SchedulingConfig(max_concurrency=1, class_weights={"interactive": 3, "bulk": 1})
+    )
+    order = []
+    blocker = asyncio.Event()
+
+    async def record(label):
+        order.append(label)
+
+    first = asyncio.create_task(
+        dispatcher.run(make_tool("hold"), lambda: blocker.wait())
+    )
+    await asyncio.sleep(0)
+
+    tasks = []
+    for i in range(4):
+        tasks.append(
+            asyncio.create_task(
+                dispatcher.run(
+                    make_tool("bulk", tool_class="bulk"),
+                    lambda i=i: record(f"b{i}"),
+                )
+            )
+        )
+        tasks.append(
+            asyncio.create_task(
+                dispatcher.run(make_tool("echo"), lambda i=i: record(f"i{i}"))
+            )
+        )
+    await asyncio.sleep(0)
+
+    blocker.set()
+    await asyncio.gather(first, *tasks)
+
+    # With weights 3:1, interactive gets two slots for each bulk slot here
+    # because the held interactive call already used up a share.
+    assert order == ["b0", "i0", "i1", "b1", "i2", "i3", "b2", "b3"]
+
+
+@pytest.mark.asyncio
+async def test_priority_orders_calls_within_class(make_tool):
+    dispatcher = Dispatcher(SchedulingConfig(max_concurrency=1))
+    order = []
+    blocker = asyncio.Event()
+
+    async def record(label):
+        order.append(label)
+
+    first = asyncio.create_task(
+        dispatcher.run(make_tool("hold"), lambda: blocker.wait())
+    )
+    await asyncio.sleep(0)
+    low = asyncio.create_task(
+        dispatcher.run(make_tool("low", priority=0), lambda: record("low"))
+    )
+    high = asyncio.create_task(
+        dispatcher.run(make_tool("high", priority=5), lambda: record("high"))
+    )
+    await asyncio.sleep(0)
+
+    blocker.set()
+    await asyncio.gather(first, low, high)
+
+    assert order == ["high", "low"]
+
+
+@pytest.mark.asyncio
+async def test_unmeetable_deadline_is_dropped_early(make_tool):
+    dispatcher = Dispatcher(
+        SchedulingConfig(max_concurrency=1, drop_unmeetable_deadlines=True)
+    )
+    blocker = asyncio.Event()
+
+    first = asyncio.create_task(
+        dispatcher.run(make_tool("hold"), lambda: blocker.wait())
+    )
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueueDeadlineError):
+        await dispatcher.run(
+            make_tool("short", timeout_sec=0.05), lambda: asyncio.sleep(0)
+        )
+
+    assert dispatcher.metrics.counters["dropped.interactive"] == 1
+
+    blocker.set()
+    await first
+    assert dispatcher.running == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_drop_takes_no_slot(make_tool):
+    dispatcher = Dispatcher(
+        SchedulingConfig(max_concurrency=1, drop_unmeetable_deadlines=True)
+    )
+    blocker = asyncio.Event()
+    waiter = None
+
+    async def hold():
+        await blocker.wait()
+        # Cancel the waiter in the same tick its drop is decided.
+        waiter.cancel()
+
+    holder = asyncio.create_task(dispatcher.run(make_tool("hold"), hold))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(
+        dispatcher.run(make_tool("slow", timeout_sec=1), lambda: asyncio.sleep(0))
+    )
+    await asyncio.sleep(0)
+    # Only now does the queued call look unable to finish in time.
+    dispatcher.metrics.observe("service.slow", 10)
+    blocker.set()
+
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert dispatcher.running == 0
+    assert dispatcher.running_by_class == {"interactive": 0}
+    assert dispatcher.metrics.counters["dropped.interactive"] == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_estimate_ignores_queue_wait(make_tool):
+    dispatcher = Dispatcher(
+        SchedulingConfig(max_concurrency=1, drop_unmeetable_deadlines=True)
+    )
+    # Past calls spent a second queued but only a millisecond running.
+    dispatcher.metrics.observe("tool.short", 1.0)
+    dispatcher.metrics.observe("service.short", 0.001)
+    blocker = asyncio.Event()
+
+    first = asyncio.create_task(
+        dispatcher.run(make_tool("hold"), lambda: blocker.wait())
+    )
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(
+        dispatcher.run(make_tool("short", timeout_sec=0.5), lambda: asyncio.sleep(0))
+    )
+    await asyncio.sleep(0.05)
+    blocker.set()
+
+    await asyncio.gather(first, queued)
+    assert "dropped.interactive" not in dispatcher.metrics.counters
+
+
+@pytest.mark.asyncio
+async def test_service_time_excludes_queue_wait(make_tool):
+    dispatcher = Dispatcher(SchedulingConfig(max_concurrency=1))
+    blocker = asyncio.Event()
+
+    first = asyncio.create_task(
+        dispatcher.run(make_tool("hold"), lambda: blocker.wait())
+    )
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(
+        dispatcher.run(make_tool("echo"), lambda: asyncio.sleep(0))
+    )
+    await asyncio.sleep(0.1)
+    blocker.set()
+    await asyncio.gather(first, queued)
+
+    assert dispatcher.metrics.latency("tool.echo").percentile(50) >= 0.1
+    assert dispatcher.metrics.latency("service.echo").percentile(50) < 0.05
+
+
+@pytest.mark.asyncio
+async def test_timed_call_adds_up_attempts_in_tasks(make_tool):
+    dispatcher = Dispatcher(SchedulingConfig(max_concurrency=1))
+    tool = make_tool("echo")
+    blocker = asyncio.Event()
+    hold = asyncio.create_task(
+        dispatcher.run(make_tool("hold"), lambda: blocker.wait())
+    )
+    await asyncio.sleep(0)
+
+    with timed_call() as timing:
+        queued = asyncio.create_task(dispatcher.run(tool, lambda: asyncio.sleep(0.05)))
+        await asyncio.sleep(0.1)
+        blocker.set()
+        await asyncio.gather(hold, queued)
+        await dispatcher.run(tool, lambda: asyncio.sleep(0.05))
+
+    assert 0.1 <= timing.service_sec < 0.15
+    assert timing.queue_sec >= 0.1
+    # Calls outside the block aren't counted.
+    await dispatcher.run(tool, lambda: asyncio.sleep(0.05))
+    assert timing.service_sec < 0.15
+
+
+@pytest.mark.asyncio
+async def test_class_latency_metrics_exported(make_tool):
+    dispatcher = Dispatcher(SchedulingConfig(max_concurrency=4))
+    bulk = make_tool("curl_get", tool_class="bulk")
+
+    for _ in range(5):
+        await dispatcher.run(bulk, lambda: asyncio.sleep(0))
+
+    snapshot = dispatcher.metrics.snapshot()
+    summary = snapshot["latencies"]["class.bulk"]
+    assert summary["count"] == 5
+    assert summary["p99"] is not None
+    assert "queue_wait.bulk" in snapshot["latencies"]
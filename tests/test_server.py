@@ -0,0 +1,38 @@
+"""Tests for the server entry points."""
+
+import sys
+
+import pytest
+
+from mcp_stdio_toolbox import server
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+
+CONFIG = f"""
+tools:
+  - name: "python_exec"
+    description: "Run Python"
+    command: "{sys.executable}"
+    input_schema:
+      type: object
+  - name: "typo"
+    description: "Bad schema"
+    command: "{sys.executable}"
+    input_schema:
+      type: objekt
+"""
+
+
+@pytest.mark.asyncio
+async def test_check_config_builds_handlers(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(server, "registry", ToolRegistry())
+    config_path = tmp_path / "tools.yaml"
+    config_path.write_text(CONFIG)
+
+    exit_code = await server.check_config(str(config_path))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert exit_code == 1
+    assert lines[0].startswith("ok   python_exec")
+    assert lines[1].startswith("FAIL typo")
+    assert "Invalid: 'objekt' is not valid" in lines[1]
+    assert lines[2] == "1/2 tools healthy"
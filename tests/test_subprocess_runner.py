@@ -1,13 +1,21 @@
 """Tests for subprocess runner."""
 
+import json
+import os
+
 import pytest
 
 from mcp_stdio_toolbox.subprocess_runner import (
     SubprocessResult,
+    argv_inputs,
     build_command_args,
+    build_stdin_payload,
     run_command,
 )
 
+# Several times the kernel's limit on argv plus environment size
+LARGE_PAYLOAD_BYTES = 4 * os.sysconf("SC_ARG_MAX")
+
 
 @pytest.mark.asyncio
 async def test_successful_command():
@@ -193,3 +201,70 @@ def test_subprocess_result_defaults():
     assert result.stderr == "error"
     assert result.exit_code == 0
     assert result.truncated is False
+
+
+@pytest.mark.asyncio
+async def test_stdin_payload_far_above_arg_max():
+    payload = b"p" * LARGE_PAYLOAD_BYTES
+    script = "import sys; print(len(sys.stdin.buffer.read()))"
+
+    result = await run_command("python3", ["-c", script], stdin_data=payload)
+
+    assert result.exit_code == 0
+    assert int(result.stdout) == LARGE_PAYLOAD_BYTES
+
+
+@pytest.mark.asyncio
+async def test_stdin_streamed_while_output_is_read():
+    # cat echoes as it reads, so stdout fills its pipe long before stdin is
+    # fully written; this only finishes if both are serviced concurrently.
+    payload = b"0123456789abcdef" * (LARGE_PAYLOAD_BYTES // 16)
+
+    result = await run_command(
+        "cat", [], max_output_bytes=2 * LARGE_PAYLOAD_BYTES, stdin_data=payload
+    )
+
+    assert result.exit_code == 0
+    assert len(result.stdout) == len(payload)
+
+
+@pytest.mark.asyncio
+async def test_stdin_ignored_by_child():
+    # A child that exits without reading stdin must not break the runner
+    result = await run_command("true", [], stdin_data=b"x" * LARGE_PAYLOAD_BYTES)
+
+    assert result.exit_code == 0
+
+
+@pytest.mark.asyncio
+async def test_stdin_is_empty_without_payload():
+    result = await run_command(
+        "python3", ["-c", "import sys; print(repr(sys.stdin.read()))"]
+    )
+
+    assert result.stdout.strip() == "''"
+
+
+def test_build_stdin_payload_property():
+    inputs = {"prompt": "hello", "model": "gpt-5"}
+
+    assert build_stdin_payload("prompt", inputs) == b"hello"
+    assert build_stdin_payload("missing", inputs) == b""
+    assert build_stdin_payload(None, inputs) is None
+    assert build_stdin_payload("items", {"items": [1, 2]}) == b"[1, 2]"
+
+
+def test_build_stdin_payload_all_arguments():
+    inputs = {"prompt": "hello", "max_tokens": 10}
+
+    payload = build_stdin_payload("*", inputs)
+
+    assert json.loads(payload) == inputs
+
+
+def test_argv_inputs_excludes_stdin_property():
+    inputs = {"prompt": "hello", "model": "gpt-5"}
+
+    assert argv_inputs(None, inputs) == inputs
+    assert argv_inputs("prompt", inputs) == {"model": "gpt-5"}
+    assert argv_inputs("*", inputs) == {}
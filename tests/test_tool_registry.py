@@ -1,10 +1,11 @@
 """Tests for tool registry."""
 
+import os
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from mcp_stdio_toolbox.config_loader import ToolConfig
+from mcp_stdio_toolbox.config_loader import ServerConfig, ToolConfig
 from mcp_stdio_toolbox.tool_registry import ToolRegistry
 
 
@@ -81,7 +82,11 @@ async def test_tool_handler_success(mock_run_command, sample_tool_config):
     assert result[0]["text"] == "hello world"
 
     mock_run_command.assert_called_once_with(
-        "echo", ["hello world"], sample_tool_config.timeout_sec
+        "echo",
+        ["hello world"],
+        sample_tool_config.timeout_sec,
+        1048576,
+        stdin_data=None,
     )
 
 
@@ -136,3 +141,68 @@ async def test_tool_handler_invalid_input(sample_tool_config):
     # Wrong type
     with pytest.raises(ValueError, match="Invalid arguments"):
         await handler({"text": 123})
+
+
+def test_handlers_are_built_lazily(sample_tool_config):
+    registry = ToolRegistry()
+    registry.register_tool(sample_tool_config)
+
+    assert "echo_test" in registry.handlers
+    assert not registry.handlers.is_built("echo_test")
+    assert registry.get_tool_definitions()[0]["name"] == "echo_test"
+    assert not registry.handlers.is_built("echo_test")
+
+    handler = registry.get_handler("echo_test")
+
+    assert registry.handlers.is_built("echo_test")
+    assert registry.get_handler("echo_test") is handler
+
+
+def test_reregistering_rebuilds_handler(sample_tool_config):
+    registry = ToolRegistry()
+    registry.register_tool(sample_tool_config)
+    handler = registry.get_handler("echo_test")
+
+    registry.register_tool(sample_tool_config)
+
+    assert not registry.handlers.is_built("echo_test")
+    assert registry.get_handler("echo_test") is not handler
+
+
+@pytest.mark.asyncio
+async def test_tool_handler_sends_property_to_stdin():
+    registry = ToolRegistry()
+    registry.register_tool(
+        ToolConfig(
+            name="codex_chat",
+            description="Prompt on stdin",
+            command="python3",
+            args=["-c", "import sys; print(sys.argv[1:], len(sys.stdin.read()))"],
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "prompt": {"type": "string"},
+                    "model": {"type": "string"},
+                },
+                "arg_mapping": [["model"], ["prompt"]],
+            },
+            stdin_from="prompt",
+        )
+    )
+    handler = registry.get_handler("codex_chat")
+    prompt = "q" * 4 * os.sysconf("SC_ARG_MAX")
+
+    result = await handler({"prompt": prompt, "model": "gpt-5"})
+
+    assert result[0]["text"].strip() == f"['gpt-5'] {len(prompt)}"
+
+
+@pytest.mark.asyncio
+async def test_server_output_limit_applies_to_commands(sample_tool_config):
+    registry = ToolRegistry()
+    registry.configure(ServerConfig(max_output_bytes=5))
+    registry.register_tool(sample_tool_config)
+
+    result = await registry.get_handler("echo_test")({"text": "hello world"})
+
+    assert result[0]["text"].startswith("hello\n[OUTPUT TRUNCATED]")
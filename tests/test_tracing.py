@@ -0,0 +1,127 @@
+"""Tests for request tracing."""
+
+import json
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import SchedulingConfig, TracingConfig
+from mcp_stdio_toolbox.metrics import Metrics
+from mcp_stdio_toolbox.scheduler import Dispatcher
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+from mcp_stdio_toolbox.tracing import (
+    OpenTelemetryTracer,
+    Tracer,
+    configure_tracing,
+    set_tracer,
+    start_span,
+)
+
+
+@pytest.fixture
+def exporter():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    previous = set_tracer(OpenTelemetryTracer(provider))
+    yield exporter
+    set_tracer(previous)
+    provider.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def restore_tracer():
+    previous = set_tracer(Tracer())
+    yield
+    set_tracer(previous)
+
+
+def test_disabled_tracing_is_a_noop():
+    with start_span("tools/call", {"tool.name": "echo"}) as span:
+        span.set_attribute("process.pid", 1)
+        span.record_exception(ValueError("ignored"))
+        assert not span.is_recording()
+
+
+@pytest.mark.asyncio
+async def test_subprocess_call_spans(exporter, make_tool):
+    registry = ToolRegistry()
+    registry.register_tool(make_tool("python_exec", args=["-c", "print('x' * 10)"]))
+
+    with start_span("tools/call", {"tool.name": "python_exec"}):
+        await registry.get_handler("python_exec")({})
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {"tools/call", "validate", "spawn", "execute"}
+    root = spans["tools/call"]
+    for name in ("validate", "spawn", "execute"):
+        assert spans[name].parent.span_id == root.context.span_id
+        assert spans[name].context.trace_id == root.context.trace_id
+
+    spawn, execute = spans["spawn"].attributes, spans["execute"].attributes
+    assert spawn["process.pid"] == execute["process.pid"] > 0
+    assert execute["process.exit.code"] == 0
+    assert execute["output.bytes"] == 11
+    assert execute["output.truncated"] is False
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_recorded_on_execute_span(exporter, make_tool):
+    tool = make_tool("python_exec", args=["-c", "import time; time.sleep(10)"])
+    tool.timeout_sec = 0.1
+    registry = ToolRegistry()
+    registry.register_tool(tool)
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        await registry.get_handler("python_exec")({})
+
+    execute = next(s for s in exporter.get_finished_spans() if s.name == "execute")
+    assert not execute.status.is_ok
+    assert execute.events[0].name == "exception"
+
+
+@pytest.mark.asyncio
+async def test_queue_span_only_with_concurrency_limit(exporter, make_tool):
+    async def call():
+        return "done"
+
+    tool = make_tool("python_exec", args=["-c", "pass"])
+    await Dispatcher(SchedulingConfig(), Metrics()).run(tool, call)
+    assert exporter.get_finished_spans() == ()
+
+    await Dispatcher(SchedulingConfig(max_concurrency=1), Metrics()).run(tool, call)
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "queue"
+    assert span.attributes["tool.class"] == "interactive"
+
+
+def test_jsonl_export(tmp_path):
+    pytest.importorskip("opentelemetry.sdk")
+    path = tmp_path / "traces.jsonl"
+    tracer = configure_tracing(
+        TracingConfig(enabled=True, exporter="jsonl", path=str(path))
+    )
+
+    with start_span("tools/call", {"tool.name": "echo"}):
+        with start_span("execute", {"process.exit.code": 0}):
+            pass
+    tracer.shutdown()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["execute", "tools/call"]
+    assert spans[0]["parent_id"] == spans[1]["context"]["span_id"]
+    assert spans[0]["attributes"] == {"process.exit.code": 0}
+    assert spans[1]["resource"]["attributes"]["service.name"] == "mcp-stdio-toolbox"
+
+
+def test_configure_disabled_installs_noop():
+    tracer = configure_tracing(TracingConfig())
+
+    assert type(tracer) is Tracer
+    assert not start_span("validate").is_recording()
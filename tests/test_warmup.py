@@ -0,0 +1,127 @@
+"""Tests for startup warm-up and health probing."""
+
+import asyncio
+
+import pytest
+
+from mcp_stdio_toolbox.config_loader import WarmupConfig
+from mcp_stdio_toolbox.metrics import Metrics
+from mcp_stdio_toolbox.tool_registry import ToolRegistry
+from mcp_stdio_toolbox.warmup import probe_tool, probe_tools
+
+
+@pytest.mark.asyncio
+async def test_warmup_success_records_latency(make_tool):
+    tool = make_tool("python_exec", warmup=WarmupConfig(args=["-c", "pass"]))
+
+    result = await probe_tool(tool)
+
+    assert result.healthy
+    assert result.exit_code == 0
+    assert result.latency_sec > 0
+
+
+@pytest.mark.asyncio
+async def test_warmup_unexpected_exit_code(make_tool):
+    tool = make_tool(
+        "python_exec",
+        warmup=WarmupConfig(args=["-c", "raise SystemExit(3)"], expected_exit_code=0),
+    )
+
+    result = await probe_tool(tool)
+
+    assert not result.healthy
+    assert result.exit_code == 3
+    assert "Expected exit code 0, got 3" in result.error
+
+
+@pytest.mark.asyncio
+async def test_warmup_expected_nonzero_exit_code(make_tool):
+    tool = make_tool(
+        "grep_file",
+        warmup=WarmupConfig(args=["-c", "raise SystemExit(1)"], expected_exit_code=1),
+    )
+
+    result = await probe_tool(tool)
+
+    assert result.healthy
+
+
+@pytest.mark.asyncio
+async def test_warmup_timeout_is_unhealthy(make_tool):
+    tool = make_tool(
+        "slow",
+        warmup=WarmupConfig(args=["-c", "import time; time.sleep(10)"], timeout_sec=1),
+    )
+
+    result = await probe_tool(tool)
+
+    assert not result.healthy
+    assert "timed out" in result.error
+
+
+@pytest.mark.asyncio
+async def test_missing_command_without_warmup(make_tool):
+    result = await probe_tool(make_tool("codex", command="nonexistent_command_xyz"))
+
+    assert not result.healthy
+    assert "Command not found" in result.error
+
+
+@pytest.mark.asyncio
+async def test_probe_tools_records_metrics(make_tool):
+    metrics = Metrics()
+    tools = [
+        make_tool("ok", warmup=WarmupConfig(args=["-c", "pass"])),
+        make_tool("missing", command="nonexistent_command_xyz"),
+    ]
+
+    results = await probe_tools(tools, metrics)
+
+    assert [result.healthy for result in results] == [True, False]
+    assert metrics.gauges["healthy.ok"] is True
+    assert metrics.gauges["healthy.missing"] is False
+    assert metrics.latency("warmup.ok").count == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_warm_up_marks_unhealthy_tools(make_tool):
+    registry = ToolRegistry()
+    registry.register_tool(make_tool("ok"))
+    registry.register_tool(make_tool("missing", command="nonexistent_command_xyz"))
+
+    await registry.warm_up()
+
+    assert registry.health == {"ok": True, "missing": False}
+    annotations = {
+        definition["name"]: definition["annotations"]
+        for definition in registry.get_tool_definitions()
+    }
+    assert annotations["missing"] == {"healthy": False}
+
+
+@pytest.mark.asyncio
+async def test_python_probe_imports_off_the_event_loop(
+    make_tool, tmp_path, monkeypatch
+):
+    (tmp_path / "slow_import_tool.py").write_text(
+        "import time\ntime.sleep(0.5)\n\ndef run():\n    return 'ok'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    tool = make_tool(
+        "slow", tool_type="python", command="", function="slow_import_tool:run"
+    )
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.05)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    result = await probe_tool(tool)
+    ticker.cancel()
+
+    assert result.healthy
+    assert ticks >= 5